@@ -0,0 +1,406 @@
+"""Modo de serviço assíncrono (ASGI) do Quarto Poder News.
+
+No modo WSGI (`gunicorn app:app`) cada requisição prende uma thread do começo
+ao fim: enquanto o cliente envia o corpo devagar, enquanto o SMTP responde e
+enquanto uma conexão lenta lê a resposta. Aqui o laço de eventos do uvicorn
+cuida das conexões e só entrega trabalho às threads quando há o que fazer:
+
+  * o corpo da requisição é lido por completo no laço antes de ocupar uma
+    thread (uploads lentos não seguram o pool);
+  * o app Flask roda num pool de threads limitado (ASGI_THREADS), que é onde
+    acontece todo o trabalho de banco - conexões SQLite por thread ou o pool
+    do PostgreSQL continuam valendo como no modo WSGI;
+  * a resposta volta ao laço em pedaços e é enviada sem prender a thread
+    (a não ser em exportações grandes, que ficam numa thread até o fim);
+  * inscrição na newsletter e formulário de contato têm handlers assíncronos:
+    o banco roda no pool e o email sai por SMTP assíncrono (aiosmtplib), de
+    modo que um SMTP lento não ocupa thread nenhuma.
+
+Dependências opcionais deste modo (requirements-asgi.txt): uvicorn (servidor)
+e aiosmtplib. Sem o aiosmtplib o envio cai para o EmailService síncrono
+dentro do pool.
+
+Uso:
+    uvicorn asgi:app --host 0.0.0.0 --port 8000
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import aiosmtplib
+except ImportError:  # envio assíncrono opcional
+    aiosmtplib = None
+
+from app import (CORS_ORIGINS, EMAIL_CONFIG, EmailService, app as flask_app, db, email_service, encerrar_worker,
+                 logger, mensagem_confirmacao_inscricao, mensagem_contato, refresh_after_restore, resposta_contato,
+                 resposta_inscricao, scheduler, validar_contato, validar_inscricao)
+
+# =====================================================
+# CONFIGURAÇÃO DO MODO ASGI
+# =====================================================
+ASGI_CONFIG = {
+    # Threads para o app Flask e o banco; com PostgreSQL, manter <= PG_POOL_MAX
+    'threads': int(os.getenv('ASGI_THREADS', '16')),
+    # Conexões SMTP simultâneas por processo (o Gmail limita conexões paralelas)
+    'smtp_concurrency': int(os.getenv('ASGI_SMTP_CONCURRENCY', '8')),
+    # Corpo acima disso vai para disco enquanto é recebido
+    'spool_bytes': int(os.getenv('ASGI_SPOOL_KB', '1024')) * 1024,
+    'max_body_bytes': flask_app.config['MAX_CONTENT_LENGTH'],
+    # Pedaços da resposta enfileirados antes de a thread esperar o cliente
+    'response_buffer': int(os.getenv('ASGI_RESPONSE_BUFFER', '8')),
+}
+
+
+class ClienteDesconectado(Exception):
+    pass
+
+
+class CorpoGrandeDemais(Exception):
+    pass
+
+
+# =====================================================
+# POOL DE THREADS (BANCO E APP WSGI)
+# =====================================================
+class PoolDeThreads:
+    """Executor por processo, criado sob demanda (depois do fork do gunicorn)"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(self.config['threads'], thread_name_prefix='qpn-asgi')
+                    self._pid = os.getpid()
+        return self._executor
+
+    async def executar(self, func: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def no_banco(self, func: Callable, *args):
+        """Roda uma operação de banco no pool, como se fosse uma requisição Flask"""
+        def tarefa():
+            refresh_after_restore()
+            try:
+                return func(*args)
+            finally:
+                db.liberar()
+        return await self.executar(tarefa)
+
+    def encerrar(self):
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._pid = None
+
+
+pool = PoolDeThreads(ASGI_CONFIG)
+
+
+# =====================================================
+# EMAIL ASSÍNCRONO
+# =====================================================
+class EmailAssincrono:
+    """Envia emails sem bloquear o laço de eventos.
+
+    Com aiosmtplib, cada envio abre sua própria conexão SMTP no laço (o
+    EmailService global guarda uma única conexão e não serve para envios
+    concorrentes). Sem aiosmtplib, um EmailService novo roda no pool.
+    """
+
+    def __init__(self, config: Dict, concorrencia: int):
+        self.config = config
+        self.concorrencia = concorrencia
+        self._semaforo: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaforo(self) -> asyncio.Semaphore:
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.concorrencia)
+        return self._semaforo
+
+    async def enviar(self, to_email: str, subject: str, html_content: str, plain_text: str = None) -> bool:
+        async with self.semaforo:
+            if aiosmtplib is None:
+                return await pool.executar(self._enviar_sincrono, to_email, subject, html_content, plain_text)
+            msg = email_service.montar_mensagem(to_email, subject, html_content, plain_text)
+            autenticar = bool(self.config['sender_password'])
+            try:
+                await aiosmtplib.send(
+                    msg,
+                    hostname=self.config['smtp_server'],
+                    port=self.config['smtp_port'],
+                    start_tls=self.config['smtp_starttls'],
+                    username=self.config['sender_email'] if autenticar else None,
+                    password=self.config['sender_password'] if autenticar else None,
+                    timeout=self.config['smtp_timeout'],
+                )
+            except Exception:
+                logger.exception("Erro ao enviar email", extra={'to_email': to_email})
+                return False
+            logger.info("Email enviado", extra={'to_email': to_email})
+            return True
+
+    @staticmethod
+    def _enviar_sincrono(to_email: str, subject: str, html_content: str, plain_text: str = None) -> bool:
+        servico = EmailService()
+        try:
+            return servico.send_email(to_email, subject, html_content, plain_text)
+        finally:
+            servico.disconnect()
+
+
+email_assincrono = EmailAssincrono(EMAIL_CONFIG, ASGI_CONFIG['smtp_concurrency'])
+
+
+# =====================================================
+# REQUISIÇÃO / RESPOSTA ASGI
+# =====================================================
+def cabecalho(scope: Dict, nome: bytes) -> str:
+    for chave, valor in scope['headers']:
+        if chave == nome:
+            return valor.decode('latin-1')
+    return ''
+
+
+async def ler_corpo(receive, limite: int, spool: int) -> tempfile.SpooledTemporaryFile:
+    """Lê o corpo inteiro no laço; a thread só é ocupada depois disso"""
+    corpo = tempfile.SpooledTemporaryFile(max_size=spool)
+    total = 0
+    while True:
+        mensagem = await receive()
+        if mensagem['type'] == 'http.disconnect':
+            corpo.close()
+            raise ClienteDesconectado()
+        dados = mensagem.get('body', b'')
+        total += len(dados)
+        if total > limite:
+            corpo.close()
+            raise CorpoGrandeDemais()
+        corpo.write(dados)
+        if not mensagem.get('more_body', False):
+            corpo.seek(0)
+            return corpo
+
+
+async def enviar_json(send, scope: Dict, dados: Dict, status: int = 200):
+    headers = [(b'content-type', b'application/json'),
+               (b'x-request-id', (cabecalho(scope, b'x-request-id') or uuid.uuid4().hex[:16])[:64].encode('latin-1'))]
+    origem = cabecalho(scope, b'origin')
+    if origem in CORS_ORIGINS:
+        headers += [(b'access-control-allow-origin', origem.encode('latin-1')),
+                    (b'access-control-allow-credentials', b'true'),
+                    (b'vary', b'Origin')]
+    corpo = json.dumps(dados).encode('utf-8')
+    headers.append((b'content-length', str(len(corpo)).encode('latin-1')))
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': corpo})
+
+
+def montar_environ(scope: Dict, corpo, tamanho: int) -> Dict:
+    servidor = scope.get('server') or ('localhost', 80)
+    cliente = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': servidor[0],
+        'SERVER_PORT': str(servidor[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': cliente[0],
+        'REMOTE_PORT': str(cliente[1]),
+        'CONTENT_LENGTH': str(tamanho),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': corpo,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for chave, valor in scope['headers']:
+        nome = chave.decode('latin-1').upper().replace('-', '_')
+        valor = valor.decode('latin-1')
+        if nome == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = valor
+            continue
+        if nome == 'CONTENT_LENGTH':
+            continue
+        nome = 'HTTP_' + nome
+        environ[nome] = f"{environ[nome]},{valor}" if nome in environ else valor
+    return environ
+
+
+# =====================================================
+# HANDLERS ASSÍNCRONOS (ROTAS COM EMAIL)
+# =====================================================
+async def inscrever_newsletter(dados: Optional[Dict]) -> Tuple[Dict, int]:
+    """Mesma resposta de app.inscrever_newsletter; banco no pool, email no laço"""
+    email, nome, erro = validar_inscricao(dados)
+    if erro:
+        return {'success': False, 'error': erro}, 400
+    try:
+        inscrito = await pool.no_banco(db.inscrever_email, email, nome)
+    except Exception:
+        logger.exception("Erro na inscrição")
+        return {'success': False, 'error': 'Erro ao processar inscrição'}, 500
+    if inscrito is None:
+        return resposta_inscricao(email, nome, inscrito), 200
+
+    subject, html_content, plain_text = mensagem_confirmacao_inscricao(email, nome)
+    email_enviado = await email_assincrono.enviar(email, subject, html_content, plain_text)
+    if email_enviado:
+        logger.info("Email de confirmação enviado", extra={'to_email': email})
+    else:
+        logger.warning("Falha ao enviar email de confirmação", extra={'to_email': email})
+        email_service.enfileirar(email, subject, html_content, plain_text)
+    return resposta_inscricao(email, nome, inscrito, email_enviado), 200
+
+
+async def public_contato(dados: Optional[Dict]) -> Tuple[Dict, int]:
+    campos, erro = validar_contato(dados)
+    if erro:
+        return {'success': False, 'error': erro}, 400
+    to_email, subject, html_content = mensagem_contato(**campos)
+    return resposta_contato(await email_assincrono.enviar(to_email, subject, html_content))
+
+
+ROTAS_ASSINCRONAS = {
+    ('POST', '/api/newsletter/inscrever'): inscrever_newsletter,
+    ('POST', '/api/public/contato'): public_contato,
+}
+
+
+# =====================================================
+# APLICAÇÃO ASGI
+# =====================================================
+class QuartoPoderASGI:
+    """Roteia as rotas assíncronas e entrega o resto ao Flask no pool de threads"""
+
+    def __init__(self, wsgi_app, rotas: Dict, config: Dict):
+        self.wsgi_app = wsgi_app
+        self.rotas = rotas
+        self.config = config
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            return
+        try:
+            corpo = await ler_corpo(receive, self.config['max_body_bytes'], self.config['spool_bytes'])
+        except ClienteDesconectado:
+            return
+        except CorpoGrandeDemais:
+            return await enviar_json(send, scope, {'success': False, 'error': 'Requisição grande demais'}, 413)
+
+        with corpo:
+            handler = self.rotas.get((scope['method'], scope['path']))
+            if handler is None:
+                return await self.via_wsgi(scope, corpo, send)
+            try:
+                dados = json.loads(corpo.read() or b'null')
+            except ValueError:
+                dados = None
+            resposta, status = await handler(dados if isinstance(dados, dict) else None)
+            await enviar_json(send, scope, resposta, status)
+
+    async def lifespan(self, receive, send):
+        while True:
+            mensagem = await receive()
+            if mensagem['type'] == 'lifespan.startup':
+                scheduler.ensure_started()
+                await send({'type': 'lifespan.startup.complete'})
+            elif mensagem['type'] == 'lifespan.shutdown':
+                await pool.executar(encerrar_worker)
+                await asyncio.get_running_loop().run_in_executor(None, pool.encerrar)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def via_wsgi(self, scope: Dict, corpo, send):
+        """Executa o Flask numa thread; os pedaços da resposta voltam por uma fila limitada.
+
+        A thread só espera o cliente quando a fila enche (respostas grandes ou
+        em streaming), o que também mantém um gerador de exportação inteiro na
+        mesma thread e, portanto, na mesma conexão de banco.
+        """
+        loop = asyncio.get_running_loop()
+        fila: asyncio.Queue = asyncio.Queue(self.config['response_buffer'])
+        cancelado = threading.Event()
+        tamanho = corpo.seek(0, os.SEEK_END)
+        corpo.seek(0)
+        environ = montar_environ(scope, corpo, tamanho)
+
+        def produzir(item):
+            asyncio.run_coroutine_threadsafe(fila.put(item), loop).result()
+
+        def start_response(status, headers, exc_info=None):
+            produzir(('inicio', (int(status.split(' ', 1)[0]), headers)))
+            return lambda dados: produzir(('corpo', dados))
+
+        def executar():
+            try:
+                resposta = self.wsgi_app(environ, start_response)
+                try:
+                    for dados in resposta:
+                        if cancelado.is_set():
+                            break
+                        if dados:
+                            produzir(('corpo', dados))
+                finally:
+                    if hasattr(resposta, 'close'):
+                        resposta.close()
+            except BaseException as e:
+                produzir(('erro', e))
+            else:
+                produzir(('fim', None))
+
+        tarefa = loop.run_in_executor(pool.executor, executar)
+        iniciado = False
+        pendente: Optional[bytes] = None
+        try:
+            while True:
+                tipo, valor = await fila.get()
+                if tipo == 'inicio':
+                    status, headers = valor
+                    await send({'type': 'http.response.start', 'status': status,
+                                'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers]})
+                    iniciado = True
+                elif tipo == 'corpo':
+                    if pendente is not None:
+                        await send({'type': 'http.response.body', 'body': pendente, 'more_body': True})
+                    pendente = valor
+                elif tipo == 'erro':
+                    logger.error("Erro no app WSGI", exc_info=valor)
+                    if not iniciado:
+                        await enviar_json(send, scope, {'success': False, 'error': 'Erro interno'}, 500)
+                    return
+                else:
+                    await send({'type': 'http.response.body', 'body': pendente or b''})
+                    return
+        finally:
+            # Cliente sumiu no meio da resposta: libera a thread e drena a fila
+            cancelado.set()
+            while not tarefa.done():
+                while not fila.empty():
+                    fila.get_nowait()
+                await asyncio.wait({tarefa}, timeout=0.05)
+
+
+app = QuartoPoderASGI(flask_app, ROTAS_ASSINCRONAS, ASGI_CONFIG)
@@ -0,0 +1,164 @@
+"""Benchmark da compressão de noticias.conteudo (CONTENT_COMPRESSION).
+
+Gera um banco sintético com corpos de notícia em HTML e, para cada codec
+(none, zlib e zstd quando o pacote zstandard estiver instalado), mede:
+
+  * tamanho do arquivo e número de páginas depois do VACUUM;
+  * quanto do banco cabe no page cache configurado (cache_size) - o módulo
+    sqlite3 do Python não expõe os contadores de hit/miss do pager, então a
+    fração que cabe no cache é usada como estimativa da taxa de acerto;
+  * tempo de listagem (sem corpo) e de leitura de notícias aleatórias (com
+    corpo descomprimido por conteudo_texto()) com esse cache.
+
+Uso:
+    python benchmarks/compressao_conteudo.py --noticias 5000 --cache-kb 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+TMP = Path(tempfile.mkdtemp(prefix='qpn-bench-'))
+
+# O app é importado só pelo codec; DB_PATH aponta para um banco descartável
+os.environ['DB_PATH'] = str(TMP / 'app.db')
+sys.path.insert(0, str(RAIZ))
+from app import CONTENT_CONFIG, ContentCodec, zstandard  # noqa: E402
+
+PALAVRAS = ('governo prefeitura câmara projeto votação orçamento saúde educação '
+            'segurança obras investimento cidade estado população recursos secretaria '
+            'denúncia ministério público audiência contrato licitação vereador deputado '
+            'relatório fiscalização transparência economia emprego transporte').split()
+
+
+def corpo_sintetico(rng: random.Random, paragrafos: int) -> str:
+    partes = []
+    for _ in range(paragrafos):
+        frases = []
+        for _ in range(rng.randint(3, 6)):
+            frase = ' '.join(rng.choice(PALAVRAS) for _ in range(rng.randint(8, 20)))
+            frases.append(frase.capitalize() + '.')
+        partes.append('<p>' + ' '.join(frases) + '</p>')
+        if rng.random() < 0.2:
+            partes.append('<h2>' + ' '.join(rng.choice(PALAVRAS) for _ in range(5)).capitalize() + '</h2>')
+    return '\n'.join(partes)
+
+
+def criar_base(caminho: Path, total: int, paragrafos: int, seed: int):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(caminho)
+    conn.execute('''
+    CREATE TABLE noticias (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        titulo TEXT NOT NULL,
+        subtitulo TEXT,
+        conteudo TEXT NOT NULL,
+        categoria_id INTEGER,
+        status TEXT DEFAULT 'publicada',
+        data_publicacao TIMESTAMP,
+        visualizacoes INTEGER DEFAULT 0
+    )''')
+    conn.execute('CREATE INDEX idx_noticias_status ON noticias(status, data_publicacao DESC)')
+    conn.executemany(
+        'INSERT INTO noticias (titulo, subtitulo, conteudo, categoria_id, data_publicacao) VALUES (?, ?, ?, ?, ?)',
+        ((f'Notícia {i}', f'Chamada da notícia {i}', corpo_sintetico(rng, paragrafos),
+          rng.randint(1, 8), f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 12:00:00')
+         for i in range(total)))
+    conn.commit()
+    conn.close()
+
+
+def medir(base: Path, algoritmo: str, cache_kb: int, leituras: int, seed: int) -> dict:
+    codec = ContentCodec({**CONTENT_CONFIG, 'compression': algoritmo})
+    caminho = TMP / f'{algoritmo}.db'
+    shutil.copy(base, caminho)
+
+    conn = sqlite3.connect(caminho)
+    conn.create_function('conteudo_texto', 1, codec.decompress, deterministic=True)
+    inicio = time.perf_counter()
+    linhas = conn.execute('SELECT id, conteudo FROM noticias').fetchall()
+    conn.executemany('UPDATE noticias SET conteudo = ? WHERE id = ?',
+                     ((codec.compress(conteudo), noticia_id) for noticia_id, conteudo in linhas))
+    conn.commit()
+    conn.execute('VACUUM')
+    compressao_s = time.perf_counter() - inicio
+
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    paginas = conn.execute('PRAGMA page_count').fetchone()[0]
+    conn.close()
+
+    # Conexão nova, cache frio e limitado, como um worker recém-iniciado
+    conn = sqlite3.connect(caminho)
+    conn.create_function('conteudo_texto', 1, codec.decompress, deterministic=True)
+    conn.execute(f'PRAGMA cache_size = -{cache_kb}')
+
+    inicio = time.perf_counter()
+    for offset in range(0, len(linhas), 50):
+        conn.execute('''SELECT id, titulo, subtitulo, categoria_id, data_publicacao, visualizacoes
+                        FROM noticias WHERE status = 'publicada'
+                        ORDER BY data_publicacao DESC LIMIT 50 OFFSET ?''', (offset,)).fetchall()
+    listagem_s = time.perf_counter() - inicio
+
+    rng = random.Random(seed)
+    ids = [rng.randint(1, len(linhas)) for _ in range(leituras)]
+    inicio = time.perf_counter()
+    for noticia_id in ids:
+        conn.execute('SELECT titulo, conteudo_texto(conteudo) FROM noticias WHERE id = ?', (noticia_id,)).fetchone()
+    leitura_s = time.perf_counter() - inicio
+    conn.close()
+
+    tamanho = caminho.stat().st_size
+    return {
+        'codec': codec.algoritmo,
+        'arquivo_kb': round(tamanho / 1024),
+        'paginas': paginas,
+        'cabe_no_cache': round(min(1.0, cache_kb * 1024 / (paginas * page_size)), 3),
+        'compressao_s': round(compressao_s, 2),
+        'listagem_ms': round(listagem_s * 1000, 1),
+        'leitura_media_us': round(leitura_s / leituras * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--noticias', type=int, default=5000)
+    parser.add_argument('--paragrafos', type=int, default=12, help='Parágrafos por corpo.')
+    parser.add_argument('--cache-kb', type=int, default=2000, help='PRAGMA cache_size usado nas leituras.')
+    parser.add_argument('--leituras', type=int, default=5000, help='Leituras aleatórias com corpo.')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='Saída em JSON.')
+    args = parser.parse_args()
+
+    try:
+        base = TMP / 'base.db'
+        criar_base(base, args.noticias, args.paragrafos, args.seed)
+        codecs = ['none', 'zlib'] + (['zstd'] if zstandard is not None else [])
+        resultados = [medir(base, codec, args.cache_kb, args.leituras, args.seed) for codec in codecs]
+    finally:
+        shutil.rmtree(TMP, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(resultados, indent=2))
+        return
+
+    referencia = resultados[0]['arquivo_kb']
+    print(f"{args.noticias} notícias, cache de {args.cache_kb} KB")
+    print(f"{'codec':<6} {'arquivo':>10} {'redução':>8} {'páginas':>8} {'no cache':>9} "
+          f"{'listagem':>10} {'leitura':>10}")
+    for r in resultados:
+        print(f"{r['codec']:<6} {r['arquivo_kb']:>7} KB {1 - r['arquivo_kb'] / referencia:>8.0%} "
+              f"{r['paginas']:>8} {r['cabe_no_cache']:>9.0%} {r['listagem_ms']:>7} ms {r['leitura_media_us']:>7} µs")
+    if zstandard is None:
+        print("(zstd omitido: pacote zstandard não instalado)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""Peças compartilhadas pelos benchmarks HTTP: servidor SMTP local, subida do
+servidor da aplicação, cliente HTTP mínimo em asyncio e percentis."""
+
+import asyncio
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+
+def porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+# =====================================================
+# SMTP LOCAL
+# =====================================================
+class SMTPLento:
+    """Servidor SMTP mínimo (sem TLS nem AUTH) que demora `atraso` s para aceitar cada mensagem"""
+
+    def __init__(self, atraso: float = 0.0):
+        self.atraso = atraso
+        self.porta = porta_livre()
+        self.mensagens = 0
+        self._loop = asyncio.new_event_loop()
+
+    def iniciar(self):
+        pronto = threading.Event()
+
+        def rodar():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(asyncio.start_server(self._sessao, '127.0.0.1', self.porta))
+            pronto.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=rodar, daemon=True).start()
+        pronto.wait()
+
+    def env(self) -> Dict[str, str]:
+        """Variáveis que apontam o EmailService do app para este servidor"""
+        return {'SMTP_SERVER': '127.0.0.1', 'SMTP_PORT': str(self.porta), 'SMTP_STARTTLS': '0', 'GMAIL_PASS': ''}
+
+    async def _sessao(self, reader, writer):
+        writer.write(b'220 localhost ESMTP carga\r\n')
+        try:
+            while True:
+                linha = await reader.readline()
+                if not linha:
+                    break
+                comando = linha[:4].upper()
+                if comando in (b'EHLO', b'HELO'):
+                    writer.write(b'250-localhost\r\n250 8BITMIME\r\n')
+                elif comando == b'DATA':
+                    writer.write(b'354 fim com <CRLF>.<CRLF>\r\n')
+                    await writer.drain()
+                    while (await reader.readline()) not in (b'.\r\n', b''):
+                        pass
+                    await asyncio.sleep(self.atraso)
+                    self.mensagens += 1
+                    writer.write(b'250 OK\r\n')
+                elif comando == b'QUIT':
+                    writer.write(b'221 tchau\r\n')
+                    break
+                else:
+                    writer.write(b'250 OK\r\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+# =====================================================
+# SERVIDOR DA APLICAÇÃO
+# =====================================================
+def comando_servidor(servidor: str, porta: int) -> List[str]:
+    """gunicorn com gunicorn.conf.py (modo via SERVER_MODE) ou o servidor de desenvolvimento do Flask"""
+    if servidor == 'gunicorn':
+        return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py']
+    return [sys.executable, '-m', 'flask', '--app', 'app', 'run', '--port', str(porta), '--with-threads']
+
+
+def subir_servidor(comando: List[str], env: Dict[str, str], porta: int, espera: float = 60) -> subprocess.Popen:
+    processo = subprocess.Popen(comando, cwd=RAIZ, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    limite = time.monotonic() + espera
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f'{comando[2]} encerrou ao subir (código {processo.returncode}) - dependências instaladas?')
+        try:
+            status, _, _ = asyncio.run(requisicao(porta, 'GET', '/api/health', timeout=5))
+            if status == 200:
+                return processo
+        except (OSError, asyncio.TimeoutError):
+            pass
+        time.sleep(0.2)
+    processo.terminate()
+    raise RuntimeError(f'servidor não respondeu em {espera:g} s')
+
+
+def derrubar_servidor(processo: subprocess.Popen):
+    processo.terminate()
+    try:
+        processo.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        processo.kill()
+
+
+# =====================================================
+# CLIENTE HTTP
+# =====================================================
+async def requisicao(porta: int, metodo: str, caminho: str, corpo: bytes = b'', timeout: float = 10.0,
+                     cabecalhos: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+    """Uma requisição HTTP/1.1 com Connection: close; devolve status, cabeçalhos (minúsculos) e corpo"""
+    async def fazer():
+        reader, writer = await asyncio.open_connection('127.0.0.1', porta)
+        try:
+            extras = ''.join(f'{k}: {v}\r\n' for k, v in (cabecalhos or {}).items())
+            pedido = (f'{metodo} {caminho} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n{extras}'
+                      f'Content-Type: application/json\r\nContent-Length: {len(corpo)}\r\n\r\n')
+            writer.write(pedido.encode('latin-1') + corpo)
+            await writer.drain()
+            resposta = await reader.read()
+        finally:
+            writer.close()
+        if not resposta:
+            return 0, {}, b''
+        cabeca, _, conteudo = resposta.partition(b'\r\n\r\n')
+        linhas = cabeca.decode('latin-1').split('\r\n')
+        recebidos = {}
+        for linha in linhas[1:]:
+            nome, _, valor = linha.partition(':')
+            recebidos[nome.strip().lower()] = valor.strip()
+        return int(linhas[0].split(' ', 2)[1]), recebidos, conteudo
+    return await asyncio.wait_for(fazer(), timeout)
+
+
+# =====================================================
+# ESTATÍSTICAS
+# =====================================================
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil em ms de uma lista de durações em segundos (já ordenada ou não)"""
+    if not valores:
+        return 0.0
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(p / 100 * len(valores)))] * 1000
+
+
+def resumir(amostras: List[float], erros: int, duracao: float) -> Dict:
+    amostras = sorted(amostras)
+    return {
+        'requisicoes': len(amostras),
+        'erros': erros,
+        'rps': round(len(amostras) / duracao, 1) if duracao else 0.0,
+        'p50_ms': round(percentil(amostras, 50), 1),
+        'p90_ms': round(percentil(amostras, 90), 1),
+        'p95_ms': round(percentil(amostras, 95), 1),
+        'p99_ms': round(percentil(amostras, 99), 1),
+        'max_ms': round(amostras[-1] * 1000, 1) if amostras else 0.0,
+    }
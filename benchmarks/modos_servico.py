@@ -0,0 +1,189 @@
+"""Teste de carga comparando os modos de serviço WSGI e ASGI (gunicorn.conf.py).
+
+Sobe o gunicorn em cada modo (SERVER_MODE=wsgi e asgi) sobre um banco
+descartável, com o SMTP apontado para um servidor local que responde com
+atraso configurável, e dispara por um tempo fixo:
+
+  * clientes concorrentes misturando listagem pública, leitura por slug e
+    inscrição na newsletter (que envia email);
+  * clientes lentos que abrem conexões e mandam os cabeçalhos aos poucos,
+    como celulares em rede ruim.
+
+Para cada modo informa requisições/s, erros e percentis de latência, no
+total e por rota. Requer gunicorn (e uvicorn para o modo asgi).
+
+Uso:
+    python benchmarks/modos_servico.py --concorrencia 50 --lentos 20 --smtp-atraso 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from comum import RAIZ, SMTPLento, comando_servidor, derrubar_servidor, porta_livre, requisicao, resumir, subir_servidor
+
+TMP = Path(tempfile.mkdtemp(prefix='qpn-carga-'))
+
+# Banco semeado por este processo e depois servido pelo gunicorn
+os.environ['DB_PATH'] = str(TMP / 'app.db')
+sys.path.insert(0, str(RAIZ))
+from app import db  # noqa: E402
+
+ROTAS = ('listagem', 'slug', 'inscricao')
+
+
+def semear(total: int, seed: int) -> list:
+    rng = random.Random(seed)
+    categorias = ['Política', 'Economia', 'Esportes', 'Cultura']
+    slugs = []
+    for i in range(total):
+        noticia = db.create_noticia({
+            'titulo': f'Notícia de carga {i}',
+            'conteudo': '<p>' + ' '.join(rng.choice(('governo', 'cidade', 'orçamento', 'saúde')) for _ in range(300)) + '</p>',
+            'categoria': rng.choice(categorias),
+            'autor': 'Redação',
+            'status': 'publicada',
+        })
+        slugs.append(noticia['slug'])
+    return slugs
+
+
+# =====================================================
+# SERVIDOR
+# =====================================================
+def subir(modo: str, porta: int, smtp: SMTPLento, args) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        **smtp.env(),
+        'SERVER_MODE': modo,
+        'PORT': str(porta),
+        'WEB_CONCURRENCY': str(args.workers),
+        'LOG_LEVEL': 'WARNING',
+    }
+    if args.threads:
+        env['GUNICORN_THREADS'] = env['ASGI_THREADS'] = str(args.threads)
+    return subir_servidor(comando_servidor('gunicorn', porta), env, porta)
+
+
+# =====================================================
+# CLIENTES
+# =====================================================
+async def cliente(porta: int, fim: float, slugs: list, pesos: list, amostras: dict, erros: dict,
+                  rng: random.Random, timeout: float):
+    while time.monotonic() < fim:
+        rota = rng.choices(ROTAS, pesos)[0]
+        if rota == 'listagem':
+            args = ('GET', f'/api/public/noticias?limit=10&offset={rng.randrange(0, 50, 10)}')
+        elif rota == 'slug':
+            args = ('GET', f'/api/noticias/slug/{rng.choice(slugs)}')
+        else:
+            corpo = json.dumps({'email': f'carga-{uuid.uuid4().hex[:12]}@exemplo.com', 'nome': 'Carga'})
+            args = ('POST', '/api/newsletter/inscrever', corpo.encode('utf-8'))
+        inicio = time.perf_counter()
+        try:
+            status, _, _ = await requisicao(porta, *args, timeout=timeout)
+        except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+            status = 0
+        if status == 0 or status >= 500:
+            erros[rota] += 1
+        else:
+            amostras[rota].append(time.perf_counter() - inicio)
+
+
+async def cliente_lento(porta: int, fim: float, intervalo: float):
+    """Mantém uma conexão aberta mandando um cabeçalho a cada `intervalo` s"""
+    while time.monotonic() < fim:
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', porta)
+        except OSError:
+            await asyncio.sleep(intervalo)
+            continue
+        try:
+            writer.write(b'GET /api/public/noticias HTTP/1.1\r\nHost: 127.0.0.1\r\n')
+            while time.monotonic() < fim:
+                await asyncio.sleep(intervalo)
+                writer.write(b'X-Rede-Ruim: 1\r\n')
+                await writer.drain()
+        except OSError:
+            pass
+        finally:
+            writer.close()
+
+
+async def carga(porta: int, slugs: list, args) -> dict:
+    pesos = [int(p) for p in args.mix.split(',')]
+    amostras = {rota: [] for rota in ROTAS}
+    erros = {rota: 0 for rota in ROTAS}
+    fim = time.monotonic() + args.duracao
+    rng = random.Random(args.seed)
+    tarefas = [cliente(porta, fim, slugs, pesos, amostras, erros, random.Random(rng.random()), args.timeout)
+               for _ in range(args.concorrencia)]
+    tarefas += [cliente_lento(porta, fim, args.intervalo_lento) for _ in range(args.lentos)]
+    inicio = time.monotonic()
+    await asyncio.gather(*tarefas)
+    duracao = time.monotonic() - inicio
+    todas = [a for rota in ROTAS for a in amostras[rota]]
+    return {
+        **resumir(todas, sum(erros.values()), duracao),
+        'por_rota': {rota: resumir(amostras[rota], erros[rota], duracao) for rota in ROTAS},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modos', default='wsgi,asgi')
+    parser.add_argument('--duracao', type=float, default=20, help='Segundos de carga por modo.')
+    parser.add_argument('--concorrencia', type=int, default=50, help='Clientes normais simultâneos.')
+    parser.add_argument('--lentos', type=int, default=20, help='Clientes lentos simultâneos.')
+    parser.add_argument('--intervalo-lento', type=float, default=1.0, help='Segundos entre cabeçalhos do cliente lento.')
+    parser.add_argument('--smtp-atraso', type=float, default=0.5, help='Atraso do SMTP local por mensagem.')
+    parser.add_argument('--mix', default='6,3,1', help='Pesos de listagem,slug,inscricao.')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=0, help='GUNICORN_THREADS/ASGI_THREADS (0 = padrão).')
+    parser.add_argument('--noticias', type=int, default=200)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='Saída em JSON.')
+    args = parser.parse_args()
+
+    resultados = []
+    try:
+        slugs = semear(args.noticias, args.seed)
+        smtp = SMTPLento(args.smtp_atraso)
+        smtp.iniciar()
+        for modo in args.modos.split(','):
+            porta = porta_livre()
+            processo = subir(modo, porta, smtp, args)
+            try:
+                resultado = asyncio.run(carga(porta, slugs, args))
+            finally:
+                derrubar_servidor(processo)
+            resultados.append({'modo': modo, **resultado})
+    finally:
+        shutil.rmtree(TMP, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(resultados, indent=2))
+        return
+
+    print(f"{args.concorrencia} clientes + {args.lentos} lentos, {args.duracao:g} s por modo, "
+          f"SMTP com {args.smtp_atraso:g} s de atraso, {args.workers} workers")
+    print(f"{'modo':<5} {'rota':<10} {'req/s':>8} {'erros':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for r in resultados:
+        linhas = [('total', r)] + list(r['por_rota'].items())
+        for rota, m in linhas:
+            print(f"{r['modo']:<5} {rota:<10} {m['rps']:>8} {m['erros']:>6} {m['p50_ms']:>6} ms "
+                  f"{m['p95_ms']:>6} ms {m['p99_ms']:>6} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+"""Suíte de benchmarks HTTP da API, comparável entre commits.
+
+Semeia um corpus sintético (por padrão 100 mil notícias e 500 mil inscritos)
+num banco descartável, sobe o servidor com o SMTP apontado para um servidor
+local e mede cada cenário em sequência, com a mesma concorrência:
+
+  noticias_publicas   GET  /api/public/noticias (páginas e categorias variadas)
+  noticia_slug        GET  /api/noticias/slug/<slug> (popularidade Zipf)
+  busca_inscritos     GET  /api/inscritos?q=... (busca da área de inscritos)
+  listagem_inscritos  GET  /api/inscritos (filtros e páginas variadas)
+  listagem_noticias   GET  /api/noticias (listagem do painel)
+  inscricao           POST /api/newsletter/inscrever (com envio de email)
+
+A busca de notícias (Database.search_noticias) não tem rota HTTP; a busca
+medida é a de inscritos, usada a cada tecla em inscritos.html.
+
+Cada execução grava commit, parâmetros e, por cenário, req/s, erros e
+percentis de latência. Com --comparar, aponta as regressões em relação a um
+resultado anterior e sai com código 1 se alguma passar de --tolerancia.
+Semear 600 mil linhas leva alguns minutos: --cache guarda o corpus pronto
+para as próximas execuções.
+
+Uso:
+    python benchmarks/suite_api.py --saida base.json
+    python benchmarks/suite_api.py --comparar base.json --saida atual.json
+    python benchmarks/suite_api.py --noticias 5000 --inscritos 20000 --duracao 5   # rodada rápida
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote
+
+from comum import RAIZ, SMTPLento, comando_servidor, derrubar_servidor, porta_livre, requisicao, resumir, subir_servidor
+
+sys.path.insert(0, str(RAIZ))
+from dados_sinteticos import GeradorDados, gerar_dados_sinteticos  # noqa: E402
+
+TMP = Path(tempfile.mkdtemp(prefix='qpn-suite-'))
+BANCO = TMP / 'app.db'
+
+CENARIOS = ('noticias_publicas', 'noticia_slug', 'busca_inscritos', 'listagem_inscritos',
+            'listagem_noticias', 'inscricao')
+
+# =====================================================
+# CORPUS
+# =====================================================
+def semear(app, noticias: int, inscritos: int, seed: int):
+    """Mesmo gerador do `flask db-gerar-dados`, mais relacionadas e checkpoint do WAL"""
+    inicio = time.perf_counter()
+    resultado = gerar_dados_sinteticos(app.db, noticias, inscritos, seed)
+    print(f"  {resultado['noticias']} notícias e {resultado['inscritos']} inscritos "
+          f"em {time.perf_counter() - inicio:.0f} s", file=sys.stderr)
+    app.db.calcular_relacionadas()
+    app.db.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+
+def preparar_corpus(args):
+    """Copia o corpus do cache ou semeia um novo; devolve o módulo app já apontado para ele"""
+    cache = Path(args.cache) / f'corpus-{args.noticias}-{args.inscritos}-{args.seed}.db' if args.cache else None
+    if cache and cache.exists():
+        shutil.copy(cache, BANCO)
+        print(f"corpus reaproveitado de {cache}", file=sys.stderr)
+
+    os.environ['DB_PATH'] = str(BANCO)
+    import app
+
+    if not (cache and cache.exists()):
+        print(f"semeando {args.noticias} notícias e {args.inscritos} inscritos...", file=sys.stderr)
+        semear(app, args.noticias, args.inscritos, args.seed)
+        if cache:
+            cache.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(BANCO, cache)
+
+    # Tarefas periódicas pesadas (relacionadas, ranking, backup) não disparam no meio da medição
+    for tarefa in app.scheduler._tasks:
+        if tarefa['exclusive']:
+            app.db.reservar_tarefa(tarefa['name'], max(tarefa['interval'], 3600))
+    return app
+
+
+# =====================================================
+# CENÁRIOS
+# =====================================================
+class Cenarios:
+    """Gera a próxima requisição de cada cenário (método, caminho, corpo, cabeçalhos)"""
+
+    def __init__(self, app, rng: random.Random, cookie: str):
+        self.rng = rng
+        self.cookie = {'Cookie': cookie}
+        cursor = app.db.conn.cursor()
+        cursor.execute("SELECT nome FROM categorias WHERE visivel = 1")
+        self.categorias = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT slug FROM noticias WHERE status = 'publicada' ORDER BY visualizacoes DESC")
+        self.slugs = [row[0] for row in cursor.fetchall()]
+        # Zipf (s=1): poucas notícias concentram a maior parte das leituras
+        self.pesos_slug = list(itertools.accumulate(1 / (k + 1) for k in range(len(self.slugs))))
+        self.paginas_publicas = max(1, min(len(self.slugs) // 10, 100))
+        self.termos = [n.lower() for n in GeradorDados.NOMES + GeradorDados.SOBRENOMES]
+        self.termos += ['gmail', 'uol.com', 'silva12', 'mar']
+
+    def noticias_publicas(self):
+        pagina = min(int(self.rng.expovariate(0.3)), self.paginas_publicas - 1)
+        caminho = f'/api/public/noticias?limit=10&offset={pagina * 10}'
+        if self.rng.random() < 0.3:
+            caminho += f'&categoria={quote(self.rng.choice(self.categorias))}'
+        return 'GET', caminho, b'', None
+
+    def noticia_slug(self):
+        slug = self.rng.choices(self.slugs, cum_weights=self.pesos_slug)[0]
+        return 'GET', f'/api/noticias/slug/{slug}', b'', None
+
+    def busca_inscritos(self):
+        return 'GET', f'/api/inscritos?limit=50&q={quote(self.rng.choice(self.termos))}', b'', self.cookie
+
+    def listagem_inscritos(self):
+        filtro = self.rng.choice(('', '&status=ativo', '&confirmado=1', '&status=ativo&confirmado=0'))
+        offset = self.rng.randrange(0, 5000, 50)
+        return 'GET', f'/api/inscritos?limit=50&offset={offset}{filtro}', b'', self.cookie
+
+    def listagem_noticias(self):
+        offset = self.rng.randrange(0, 2000, 20)
+        return 'GET', f'/api/noticias?limit=20&offset={offset}', b'', self.cookie
+
+    def inscricao(self):
+        corpo = json.dumps({'email': f'bench-{uuid.uuid4().hex[:16]}@exemplo.com', 'nome': 'Bench'})
+        return 'POST', '/api/newsletter/inscrever', corpo.encode('utf-8'), None
+
+
+async def login(porta: int) -> str:
+    corpo = json.dumps({'email': 'admin@quartopodernews.com', 'senha': 'admin123'}).encode('utf-8')
+    status, cabecalhos, _ = await requisicao(porta, 'POST', '/api/login', corpo)
+    if status != 200 or 'set-cookie' not in cabecalhos:
+        raise RuntimeError(f'login do admin falhou (HTTP {status})')
+    return cabecalhos['set-cookie'].split(';', 1)[0]
+
+
+async def medir(porta: int, gerar, concorrencia: int, duracao: float, aquecimento: float, timeout: float) -> dict:
+    amostras, erros = [], 0
+    inicio_medicao = time.monotonic() + aquecimento
+    fim = inicio_medicao + duracao
+
+    async def cliente():
+        nonlocal erros
+        while time.monotonic() < fim:
+            metodo, caminho, corpo, cabecalhos = gerar()
+            t0 = time.perf_counter()
+            try:
+                status, _, _ = await requisicao(porta, metodo, caminho, corpo, timeout, cabecalhos)
+            except (OSError, asyncio.TimeoutError, ValueError):
+                status = 0
+            medindo = time.monotonic() >= inicio_medicao
+            if not medindo:
+                continue
+            if status == 0 or status >= 400:
+                erros += 1
+            else:
+                amostras.append(time.perf_counter() - t0)
+
+    await asyncio.gather(*(cliente() for _ in range(concorrencia)))
+    return resumir(amostras, erros, duracao)
+
+
+# =====================================================
+# RESULTADOS
+# =====================================================
+def commit_atual() -> str:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        sujo = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=RAIZ,
+                              capture_output=True, text=True).stdout.strip()
+        return commit + ('-sujo' if sujo else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'desconhecido'
+
+
+def comparar(base: dict, atual: dict, tolerancia: float) -> list:
+    """Regressões: req/s caiu ou p95 subiu mais que a tolerância (fração)"""
+    regressoes = []
+    print(f"\ncomparação com {base.get('commit', '?')} (tolerância {tolerancia:.0%})")
+    print(f"{'cenário':<20} {'req/s':^22} {'p95':^28}")
+    for nome, m in atual['cenarios'].items():
+        b = base.get('cenarios', {}).get(nome)
+        if not b:
+            continue
+        d_rps = (m['rps'] - b['rps']) / b['rps'] if b['rps'] else 0.0
+        d_p95 = (m['p95_ms'] - b['p95_ms']) / b['p95_ms'] if b['p95_ms'] else 0.0
+        pior = d_rps < -tolerancia or d_p95 > tolerancia
+        if pior:
+            regressoes.append(nome)
+        print(f"{nome:<20} {b['rps']:>7} → {m['rps']:<7}{d_rps:+.0%}  {b['p95_ms']:>7} → {m['p95_ms']:<7} ms {d_p95:+.0%}"
+              + ('  REGRESSÃO' if pior else ''))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--noticias', type=int, default=100000)
+    parser.add_argument('--inscritos', type=int, default=500000)
+    parser.add_argument('--cenarios', default=','.join(CENARIOS))
+    parser.add_argument('--concorrencia', type=int, default=16, help='Clientes simultâneos por cenário.')
+    parser.add_argument('--duracao', type=float, default=15, help='Segundos medidos por cenário.')
+    parser.add_argument('--aquecimento', type=float, default=2, help='Segundos descartados no início de cada cenário.')
+    parser.add_argument('--servidor', choices=('gunicorn', 'flask'), default='gunicorn')
+    parser.add_argument('--modo', choices=('wsgi', 'asgi'), default='wsgi', help='SERVER_MODE do gunicorn.')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--smtp-atraso', type=float, default=0.0, help='Atraso do SMTP local por mensagem.')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cache', help='Diretório para guardar/reaproveitar o corpus semeado.')
+    parser.add_argument('--saida', help='Grava o resultado em JSON neste arquivo.')
+    parser.add_argument('--comparar', help='Resultado JSON anterior para comparação.')
+    parser.add_argument('--tolerancia', type=float, default=0.15)
+    parser.add_argument('--json', action='store_true', help='Saída em JSON.')
+    args = parser.parse_args()
+
+    cenarios = [c for c in args.cenarios.split(',') if c]
+    desconhecidos = set(cenarios) - set(CENARIOS)
+    if desconhecidos:
+        parser.error(f"cenários desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    resultado = {
+        'commit': commit_atual(),
+        'data': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'parametros': {k: v for k, v in vars(args).items() if k not in ('saida', 'comparar', 'json', 'cache')},
+        'cenarios': {},
+    }
+    processo = None
+    try:
+        app = preparar_corpus(args)
+        smtp = SMTPLento(args.smtp_atraso)
+        smtp.iniciar()
+        porta = porta_livre()
+        env = {**os.environ, **smtp.env(), 'DB_PATH': str(BANCO), 'SERVER_MODE': args.modo,
+               'PORT': str(porta), 'WEB_CONCURRENCY': str(args.workers), 'LOG_LEVEL': 'WARNING'}
+        processo = subir_servidor(comando_servidor(args.servidor, porta), env, porta)
+        geradores = Cenarios(app, random.Random(args.seed), asyncio.run(login(porta)))
+        for nome in cenarios:
+            print(f"cenário {nome}...", file=sys.stderr)
+            resultado['cenarios'][nome] = asyncio.run(medir(porta, getattr(geradores, nome), args.concorrencia,
+                                                            args.duracao, args.aquecimento, args.timeout))
+        resultado['emails_recebidos'] = smtp.mensagens
+    finally:
+        if processo is not None:
+            derrubar_servidor(processo)
+        shutil.rmtree(TMP, ignore_errors=True)
+
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding='utf-8')
+    if args.json:
+        print(json.dumps(resultado, indent=2, ensure_ascii=False))
+    else:
+        print(f"commit {resultado['commit']}: {args.noticias} notícias, {args.inscritos} inscritos, "
+              f"{args.concorrencia} clientes, {args.duracao:g} s por cenário ({args.servidor}/{args.modo})")
+        print(f"{'cenário':<20} {'req/s':>8} {'erros':>6} {'p50':>9} {'p90':>9} {'p95':>9} {'p99':>9} {'máx':>9}")
+        for nome, m in resultado['cenarios'].items():
+            print(f"{nome:<20} {m['rps']:>8} {m['erros']:>6} {m['p50_ms']:>6} ms {m['p90_ms']:>6} ms "
+                  f"{m['p95_ms']:>6} ms {m['p99_ms']:>6} ms {m['max_ms']:>6} ms")
+
+    if args.comparar:
+        base = json.loads(Path(args.comparar).read_text(encoding='utf-8'))
+        if comparar(base, resultado, args.tolerancia):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
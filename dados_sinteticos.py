@@ -0,0 +1,182 @@
+"""Dados sintéticos para benchmarks e testes de carga.
+
+GeradorDados produz notícias, inscritos e visualizações fictícios com
+distribuições próximas das reais; gerar_dados_sinteticos grava um corpus
+completo num Database. Usado pelo comando `flask db-gerar-dados`, que importa
+este módulo só quando é chamado, e pela suíte em benchmarks/.
+"""
+
+import math
+import random
+import time
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class GeradorDados:
+    """Gera notícias e inscritos fictícios com distribuições próximas das reais.
+
+    Texto em "português de mentira": palavras frequentes sorteadas com peso
+    Zipf, frases e parágrafos de tamanhos variados e corpo com tamanho
+    log-normal (mediana ~500 palavras). Com a mesma seed gera os mesmos dados.
+    """
+
+    PALAVRAS = (
+        'de a o que e do da em um para com não uma os no se na por mais as dos como mas ao ele das à '
+        'seu sua ou quando muito nos já também só pelo pela até isso ela entre depois sem mesmo aos seus '
+        'quem nas esse eles essa num nem suas meu minha numa pelos elas qual lhe deles essas esses pelas '
+        'este dele tu governo prefeitura estado cidade município câmara assembleia secretaria projeto lei '
+        'votação orçamento recursos milhões investimento obras saúde educação segurança polícia hospital '
+        'escola professores alunos população moradores bairro região capital interior empresa mercado '
+        'emprego renda inflação juros economia setor produção agricultura comércio indústria turismo '
+        'festival cultura show música teatro cinema time clube jogo campeonato partida gols torcida '
+        'vereador deputado senador prefeito governador ministro presidente eleição candidato partido '
+        'denúncia investigação operação justiça tribunal processo decisão ministério público contrato '
+        'licitação relatório fiscalização audiência reunião anúncio programa serviço atendimento '
+        'rodovia trânsito chuva seca energia água saneamento transporte ônibus aeroporto porto '
+        'segundo ainda sobre durante contra após ano anos dia dias semana mês hoje ontem amanhã '
+        'novo nova grande maior primeiro última local nacional federal estadual municipal público'
+    ).split()
+
+    TAGS = (
+        'eleições 2026', 'orçamento', 'saúde pública', 'educação', 'segurança', 'infraestrutura', 'chuvas',
+        'transporte', 'câmara municipal', 'assembleia', 'governo do estado', 'prefeitura', 'economia local',
+        'emprego', 'agronegócio', 'meio ambiente', 'cultura', 'futebol', 'tecnologia', 'turismo',
+        'investigação', 'justiça', 'licitações', 'saneamento', 'habitação', 'vacinação', 'trânsito',
+        'energia', 'inflação', 'concursos',
+    )
+
+    NOMES = (
+        'Ana', 'Maria', 'João', 'José', 'Pedro', 'Paulo', 'Carla', 'Fernanda', 'Lucas', 'Mariana', 'Rafael',
+        'Juliana', 'Gabriel', 'Beatriz', 'Marcos', 'Patrícia', 'Bruno', 'Camila', 'Rodrigo', 'Aline',
+        'Francisco', 'Antônia', 'Luiz', 'Raimunda', 'Carlos', 'Francisca', 'Tiago', 'Letícia',
+    )
+    SOBRENOMES = (
+        'Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Ferreira', 'Costa', 'Rodrigues',
+        'Almeida', 'Nascimento', 'Carvalho', 'Araújo', 'Ribeiro', 'Gomes', 'Martins', 'Barbosa', 'Rocha',
+    )
+    STATUS = ('publicada', 'rascunho', 'arquivada')
+    PESOS_STATUS = (90, 7, 3)
+    DOMINIOS = ('gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com.br', 'uol.com.br', 'bol.com.br',
+                'terra.com.br', 'icloud.com')
+
+    def __init__(self, seed: int = None, categorias: List[str] = None):
+        self.rng = random.Random(seed)
+        self.categorias = list(categorias or ['Política', 'Economia', 'Esportes', 'Cultura', 'Tecnologia', 'Saúde'])
+        self._pesos_palavras = self._zipf_acumulado(len(self.PALAVRAS), 0.8)
+        self._pesos_tags = self._zipf_acumulado(len(self.TAGS))
+        # Editorias do começo da lista (ordem do site) publicam mais
+        self._pesos_categorias = self._zipf_acumulado(len(self.categorias), 0.7)
+
+    @staticmethod
+    def _zipf_acumulado(n: int, expoente: float = 1.0) -> List[float]:
+        acumulado, total = [], 0.0
+        for k in range(1, n + 1):
+            total += 1 / k ** expoente
+            acumulado.append(total)
+        return acumulado
+
+    def _palavras(self, quantidade: int) -> List[str]:
+        return self.rng.choices(self.PALAVRAS, cum_weights=self._pesos_palavras, k=quantidade)
+
+    def frase(self, minimo: int = 8, maximo: int = 25) -> str:
+        palavras = self._palavras(self.rng.randint(minimo, maximo))
+        palavras[0] = palavras[0].capitalize()
+        return ' '.join(palavras) + self.rng.choice('....!?')
+
+    def conteudo(self) -> str:
+        alvo = int(min(max(self.rng.lognormvariate(math.log(500), 0.6), 80), 4000))
+        paragrafos, palavras = [], 0
+        while palavras < alvo:
+            frases = [self.frase() for _ in range(self.rng.randint(2, 6))]
+            palavras += sum(f.count(' ') + 1 for f in frases)
+            paragrafos.append('<p>' + ' '.join(frases) + '</p>')
+        return '\n'.join(paragrafos)
+
+    def noticias(self, total: int, dias: int = 730) -> Iterator[Tuple[int, Dict, None]]:
+        """Registros no formato de bulk_import_noticias, datas (UTC) espalhadas nos últimos `dias`"""
+        agora = datetime.now(timezone.utc)
+        for linha in range(1, total + 1):
+            titulo = self.frase(6, 14).rstrip('.!?')
+            publicada = agora - timedelta(seconds=self.rng.randint(0, dias * 86400))
+            yield linha, {
+                'titulo': titulo,
+                'subtitulo': self.frase(14, 30),
+                'conteudo': self.conteudo(),
+                'categoria': self.rng.choices(self.categorias, cum_weights=self._pesos_categorias)[0],
+                'autor': f'{self.rng.choice(self.NOMES)} {self.rng.choice(self.SOBRENOMES)}',
+                'imagem_url': (f'/static/uploads/sintetica-{self.rng.randrange(500):03d}.jpg'
+                               if self.rng.random() < 0.85 else ''),
+                'status': self.rng.choices(self.STATUS, self.PESOS_STATUS)[0],
+                'tags': ', '.join(sorted(set(self.rng.choices(self.TAGS, cum_weights=self._pesos_tags,
+                                                              k=self.rng.randint(1, 5))))),
+                'destaque': self.rng.random() < 0.03,
+                'data_publicacao': publicada.strftime('%Y-%m-%d %H:%M:%S'),
+            }, None
+
+    def inscritos(self, total: int, inicio: int = 0, dias: int = 1095) -> Iterator[Dict]:
+        """Inscritos com emails únicos (sufixo sequencial) e mistura de confirmado/status"""
+        agora = datetime.now(timezone.utc)
+        for i in range(inicio, inicio + total):
+            nome, sobrenome = self.rng.choice(self.NOMES), self.rng.choice(self.SOBRENOMES)
+            usuario = unicodedata.normalize('NFKD', f'{nome}.{sobrenome}').encode('ascii', 'ignore').decode().lower()
+            confirmado = self.rng.random() < 0.7
+            yield {
+                'email': f'{usuario}{i}@{self.rng.choice(self.DOMINIOS)}',
+                'nome': f'{nome} {sobrenome}',
+                'codigo_confirmacao': '%032x' % self.rng.getrandbits(128),
+                'confirmado': int(confirmado),
+                'receber_destaques': 1,
+                'receber_todas': int(self.rng.random() < 0.2),
+                'categorias_preferidas': None,
+                'criado_em': (agora - timedelta(seconds=self.rng.randint(0, dias * 86400))).strftime('%Y-%m-%d %H:%M:%S'),
+                'status': self.rng.choices(('ativo', 'inativo', 'cancelado'),
+                                           (85, 10, 5) if confirmado else (70, 25, 5))[0],
+            }
+
+    def visualizacoes(self, noticias: List[Tuple[int, str]], maximo: int = 50000,
+                      expoente: float = 1.1, janela_horas: int = 48) -> Iterator[Tuple[int, int, Optional[int]]]:
+        """Views Zipf por (id, data_publicacao), no formato de Database.importar_visualizacoes.
+
+        A popularidade é sorteada (não segue o id). Notícias publicadas dentro
+        da janela do ranking recebem as views no bucket da hora de publicação.
+        """
+        ordem = list(noticias)
+        self.rng.shuffle(ordem)
+        limite = int(time.time() // 3600) - janela_horas
+        for posicao, (noticia_id, data_publicacao) in enumerate(ordem, start=1):
+            views = int(maximo / posicao ** expoente)
+            if not views:
+                break
+            publicada = datetime.fromisoformat(str(data_publicacao)).replace(tzinfo=timezone.utc)
+            hora = int(publicada.timestamp() // 3600)
+            yield noticia_id, views, hora if hora >= limite else None
+
+
+def gerar_dados_sinteticos(database, noticias: int = 0, inscritos: int = 0, seed: int = None,
+                           lote: int = 5000, progresso=None) -> Dict:
+    """Popula um app.Database com notícias, visualizações e inscritos do GeradorDados"""
+    cursor = database.conn.cursor()
+    cursor.execute('SELECT nome FROM categorias WHERE visivel = 1 ORDER BY ordem, nome')
+    gerador = GeradorDados(seed, [row[0] for row in cursor.fetchall()])
+    resultado = {'noticias': 0, 'visualizacoes': 0, 'inscritos': 0}
+    if noticias:
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM noticias')
+        ultimo_id = cursor.fetchone()[0]
+        importacao = database.bulk_import_noticias(
+            gerador.noticias(noticias), lote=lote,
+            progresso=(lambda linhas, importadas: progresso('noticias', importadas)) if progresso else None)
+        resultado['noticias'] = importacao['importadas']
+        cursor.execute("SELECT id, data_publicacao FROM noticias WHERE id > ? AND status = 'publicada'",
+                       (ultimo_id,))
+        resultado['visualizacoes'] = database.importar_visualizacoes(
+            gerador.visualizacoes([(row[0], row[1]) for row in cursor.fetchall()]), lote)
+        database.atualizar_ranking_mais_lidas()
+    if inscritos:
+        antes = database.contar_inscritos()
+        database.bulk_insert_inscritos(
+            gerador.inscritos(inscritos, inicio=antes), lote=lote,
+            progresso=(lambda enviados: progresso('inscritos', enviados)) if progresso else None)
+        resultado['inscritos'] = database.contar_inscritos() - antes
+    return resultado
@@ -0,0 +1,67 @@
+"""Configuração do gunicorn do Quarto Poder News.
+
+SERVER_MODE escolhe como cada worker atende as conexões:
+
+  * wsgi (padrão): workers gthread servindo app:app - cada requisição ocupa
+    uma thread do começo ao fim, inclusive durante SMTP e clientes lentos;
+  * asgi: workers do uvicorn servindo asgi:app - um laço de eventos por
+    processo segura muitas conexões lentas e só usa o pool de threads
+    (ASGI_THREADS) para o Flask e o banco; requer uvicorn (requirements-asgi.txt).
+
+O app é carregado no master (preload) e herdado pelos workers; os hooks
+abaixo descartam no filho as conexões de banco e SMTP abertas no master e,
+no encerramento, gravam visualizações e emails que ainda estão só em memória.
+
+Uso:
+    gunicorn -c gunicorn.conf.py
+    SERVER_MODE=asgi WEB_CONCURRENCY=4 gunicorn -c gunicorn.conf.py
+"""
+
+import os
+import sys
+
+modo = os.getenv('SERVER_MODE', 'wsgi').lower()
+
+try:
+    cpus = len(os.sched_getaffinity(0))  # respeita o limite de CPUs do container
+except AttributeError:
+    cpus = os.cpu_count() or 1
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', str(min(2 * cpus + 1, int(os.getenv('GUNICORN_MAX_WORKERS', '8'))))))
+preload_app = os.getenv('GUNICORN_PRELOAD', '1').lower() in ('1', 'true', 'sim')
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = 5
+
+# Recicla workers periodicamente (vazamentos lentos, fragmentação do heap);
+# o jitter evita que todos reiniciem ao mesmo tempo
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', str(max_requests // 10)))
+
+if modo == 'asgi':
+    wsgi_app = 'asgi:app'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'app:app'
+    worker_class = 'gthread'
+    # Requisições esperam banco e SMTP mais do que usam CPU
+    threads = int(os.getenv('GUNICORN_THREADS', str(max(2, min(2 * cpus, 8)))))
+
+
+def post_fork(server, worker):
+    """Descarta as conexões de banco e SMTP herdadas do master; são reabertas sob demanda no worker"""
+    app = sys.modules.get('app')
+    if app is None:  # sem preload o worker importa o app do zero
+        return
+    app.db.reset_connections()
+    app.email_service.reset()
+    server.log.info("Worker %s: conexões herdadas descartadas", worker.pid)
+
+
+def worker_exit(server, worker):
+    """Encerramento gracioso: grava visualizações pendentes e tenta reenviar a fila de emails"""
+    app = sys.modules.get('app')
+    if app is not None:
+        app.encerrar_worker()
@@ -0,0 +1,356 @@
+-- Schema do Quarto Poder News para DB_BACKEND=postgresql.
+--
+-- Equivale ao schema SQLite depois de todas as migrações de Database.MIGRATIONS
+-- (a versão fica em main.schema_versao). É idempotente: `flask --app app
+-- db-migrate` roda o arquivo inteiro quando a versão gravada é menor que
+-- Database.SCHEMA_VERSION, então mudanças de schema entram aqui com
+-- IF NOT EXISTS / CREATE OR REPLACE, junto com a migração do SQLite.
+--
+-- Convenções herdadas do SQLite, para o mesmo SQL valer nos dois bancos:
+--   * datas são TEXT 'AAAA-MM-DD HH:MM:SS' em UTC (o formato de CURRENT_TIMESTAMP);
+--   * colunas booleanas são INTEGER 0/1;
+--   * emails são gravados em minúsculas; a unicidade sem distinção de caixa
+--     (COLLATE NOCASE no SQLite) é um índice único em lower(email);
+--   * as notícias frias ficam em arquivo.noticias.
+
+CREATE SCHEMA IF NOT EXISTS main;
+CREATE SCHEMA IF NOT EXISTS arquivo;
+SET LOCAL search_path = main;
+
+CREATE OR REPLACE FUNCTION main.agora_texto() RETURNS text
+LANGUAGE sql STABLE AS $$ SELECT to_char(now() AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS') $$;
+
+-- No SQLite descomprime o corpo; aqui o TOAST já comprime e o corpo fica em texto
+CREATE OR REPLACE FUNCTION main.conteudo_texto(conteudo text) RETURNS text
+LANGUAGE sql IMMUTABLE AS $$ SELECT conteudo $$;
+
+CREATE TABLE IF NOT EXISTS main.schema_versao (
+    versao INTEGER NOT NULL
+);
+
+-- ---------- usuários e categorias ----------
+
+CREATE TABLE IF NOT EXISTS main.usuarios (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    nome TEXT NOT NULL,
+    email TEXT NOT NULL,
+    senha_hash TEXT NOT NULL,
+    perfil TEXT NOT NULL CHECK(perfil IN ('admin', 'jornalista')),
+    status TEXT NOT NULL DEFAULT 'active' CHECK(status IN ('active', 'inactive')),
+    criado_em TEXT DEFAULT main.agora_texto(),
+    atualizado_em TEXT DEFAULT main.agora_texto(),
+    observacoes TEXT,
+    ultimo_login TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_usuarios_email_unico ON main.usuarios(lower(email));
+CREATE INDEX IF NOT EXISTS idx_usuarios_email ON main.usuarios(email);
+CREATE INDEX IF NOT EXISTS idx_usuarios_perfil ON main.usuarios(perfil, status);
+
+CREATE TABLE IF NOT EXISTS main.categorias (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    nome TEXT NOT NULL UNIQUE,
+    descricao TEXT,
+    cor TEXT DEFAULT '#003366',
+    icon TEXT DEFAULT 'fas fa-folder',
+    ordem INTEGER DEFAULT 0,
+    visivel INTEGER DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_categorias_ordem ON main.categorias(ordem, visivel);
+
+-- ---------- notícias ----------
+
+CREATE TABLE IF NOT EXISTS main.noticias (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    titulo TEXT NOT NULL,
+    subtitulo TEXT,
+    conteudo TEXT NOT NULL,
+    categoria TEXT NOT NULL,
+    autor TEXT NOT NULL,
+    autor_id INTEGER,
+    imagem_url TEXT,
+    data_publicacao TEXT DEFAULT main.agora_texto(),
+    data_atualizacao TEXT DEFAULT main.agora_texto(),
+    visualizacoes INTEGER DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'publicada' CHECK(status IN ('rascunho', 'publicada', 'arquivada')),
+    tags TEXT,
+    destaque INTEGER DEFAULT 0,
+    fonte TEXT,
+    slug TEXT,
+    enviada_newsletter INTEGER DEFAULT 0,
+    publicar_em TEXT,
+    categoria_id INTEGER REFERENCES main.categorias(id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_noticias_slug_unique ON main.noticias(slug);
+CREATE INDEX IF NOT EXISTS idx_noticias_status ON main.noticias(status);
+CREATE INDEX IF NOT EXISTS idx_noticias_destaque ON main.noticias(destaque) WHERE destaque = 1;
+CREATE INDEX IF NOT EXISTS idx_noticias_data ON main.noticias(data_publicacao DESC);
+CREATE INDEX IF NOT EXISTS idx_noticias_publicar_em ON main.noticias(publicar_em) WHERE publicar_em IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_noticias_categoria_id ON main.noticias(categoria_id, status, data_publicacao DESC);
+
+-- Revisões e visualizações sem FK: ficam em main quando a notícia vai para o arquivo
+CREATE TABLE IF NOT EXISTS main.noticias_revisoes (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    noticia_id INTEGER NOT NULL,
+    numero INTEGER NOT NULL,
+    tipo TEXT NOT NULL CHECK(tipo IN ('snapshot', 'delta')),
+    dados BYTEA NOT NULL,
+    campos TEXT NOT NULL DEFAULT '',
+    usuario_id INTEGER,
+    criado_em TEXT DEFAULT main.agora_texto(),
+    UNIQUE (noticia_id, numero)
+);
+
+CREATE TABLE IF NOT EXISTS main.noticias_views_hora (
+    noticia_id INTEGER NOT NULL,
+    hora INTEGER NOT NULL,
+    views INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (noticia_id, hora)
+);
+CREATE INDEX IF NOT EXISTS idx_views_hora_hora ON main.noticias_views_hora(hora);
+
+CREATE TABLE IF NOT EXISTS main.ranking_mais_lidas (
+    posicao INTEGER PRIMARY KEY,
+    noticia_id INTEGER NOT NULL,
+    score DOUBLE PRECISION NOT NULL,
+    calculado_em TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS main.noticias_relacionadas (
+    noticia_id INTEGER NOT NULL,
+    posicao INTEGER NOT NULL,
+    relacionada_id INTEGER NOT NULL,
+    score DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (noticia_id, posicao)
+);
+
+CREATE TABLE IF NOT EXISTS main.tarefas_agendadas (
+    nome TEXT PRIMARY KEY,
+    proxima_execucao DOUBLE PRECISION NOT NULL DEFAULT 0,
+    ultima_execucao DOUBLE PRECISION
+);
+
+-- ---------- tags ----------
+
+CREATE TABLE IF NOT EXISTS main.tags (
+    tag TEXT PRIMARY KEY,
+    nome TEXT NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tags_total ON main.tags(total DESC);
+
+CREATE TABLE IF NOT EXISTS main.noticia_tags (
+    noticia_id INTEGER NOT NULL REFERENCES main.noticias(id) ON DELETE CASCADE,
+    tag TEXT NOT NULL,
+    publicada INTEGER NOT NULL DEFAULT 0,
+    data_publicacao TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (noticia_id, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_noticia_tags_pagina
+    ON main.noticia_tags(tag, publicada, data_publicacao DESC, noticia_id DESC);
+
+CREATE OR REPLACE FUNCTION main.trg_noticias_tags_status() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE main.noticia_tags
+    SET publicada = (NEW.status = 'publicada')::int, data_publicacao = COALESCE(NEW.data_publicacao, '')
+    WHERE noticia_id = NEW.id;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION main.trg_noticia_tags_total() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.publicada <> 0 THEN
+        UPDATE main.tags SET total = total + 1 WHERE tag = NEW.tag;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') AND OLD.publicada <> 0 THEN
+        UPDATE main.tags SET total = total - 1 WHERE tag = OLD.tag;
+    END IF;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_noticias_tags_status ON main.noticias;
+CREATE TRIGGER trg_noticias_tags_status
+    AFTER UPDATE OF status, data_publicacao ON main.noticias
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status OR OLD.data_publicacao IS DISTINCT FROM NEW.data_publicacao)
+    EXECUTE FUNCTION main.trg_noticias_tags_status();
+
+DROP TRIGGER IF EXISTS trg_noticia_tags_insert ON main.noticia_tags;
+CREATE TRIGGER trg_noticia_tags_insert
+    AFTER INSERT ON main.noticia_tags
+    FOR EACH ROW WHEN (NEW.publicada <> 0)
+    EXECUTE FUNCTION main.trg_noticia_tags_total();
+
+DROP TRIGGER IF EXISTS trg_noticia_tags_delete ON main.noticia_tags;
+CREATE TRIGGER trg_noticia_tags_delete
+    AFTER DELETE ON main.noticia_tags
+    FOR EACH ROW WHEN (OLD.publicada <> 0)
+    EXECUTE FUNCTION main.trg_noticia_tags_total();
+
+DROP TRIGGER IF EXISTS trg_noticia_tags_publicada ON main.noticia_tags;
+CREATE TRIGGER trg_noticia_tags_publicada
+    AFTER UPDATE OF publicada ON main.noticia_tags
+    FOR EACH ROW WHEN (OLD.publicada IS DISTINCT FROM NEW.publicada)
+    EXECUTE FUNCTION main.trg_noticia_tags_total();
+
+-- ---------- contadores por categoria ----------
+
+CREATE TABLE IF NOT EXISTS main.categoria_contagens (
+    categoria_id INTEGER PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0,
+    ultima_publicacao TEXT
+);
+
+CREATE OR REPLACE FUNCTION main.trg_categoria_contagem() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    -- Saída: a linha antiga era publicada e deixou de contar como estava
+    IF TG_OP IN ('DELETE', 'UPDATE') AND OLD.status = 'publicada' AND (
+        TG_OP = 'DELETE' OR NEW.status IS DISTINCT FROM 'publicada'
+        OR NEW.categoria_id IS DISTINCT FROM OLD.categoria_id
+        OR NEW.data_publicacao IS DISTINCT FROM OLD.data_publicacao
+    ) THEN
+        UPDATE main.categoria_contagens
+        SET total = total - 1,
+            ultima_publicacao = (SELECT MAX(data_publicacao) FROM main.noticias
+                                 WHERE categoria_id = OLD.categoria_id AND status = 'publicada')
+        WHERE categoria_id = OLD.categoria_id;
+    END IF;
+    -- Entrada: a linha nova é publicada e passou a contar
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'publicada' AND NEW.categoria_id IS NOT NULL AND (
+        TG_OP = 'INSERT' OR OLD.status IS DISTINCT FROM 'publicada'
+        OR NEW.categoria_id IS DISTINCT FROM OLD.categoria_id
+        OR NEW.data_publicacao IS DISTINCT FROM OLD.data_publicacao
+    ) THEN
+        INSERT INTO main.categoria_contagens (categoria_id) VALUES (NEW.categoria_id) ON CONFLICT DO NOTHING;
+        UPDATE main.categoria_contagens
+        SET total = total + 1,
+            ultima_publicacao = GREATEST(COALESCE(ultima_publicacao, ''), COALESCE(NEW.data_publicacao, ''))
+        WHERE categoria_id = NEW.categoria_id;
+    END IF;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_categoria_contagem ON main.noticias;
+CREATE TRIGGER trg_categoria_contagem
+    AFTER INSERT OR DELETE OR UPDATE OF status, categoria_id, data_publicacao ON main.noticias
+    FOR EACH ROW EXECUTE FUNCTION main.trg_categoria_contagem();
+
+-- ---------- newsletter ----------
+
+CREATE TABLE IF NOT EXISTS main.inscritos (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    email TEXT NOT NULL,
+    nome TEXT,
+    codigo_confirmacao TEXT NOT NULL,
+    confirmado INTEGER DEFAULT 0,
+    receber_destaques INTEGER DEFAULT 1,
+    receber_todas INTEGER DEFAULT 0,
+    categorias_preferidas TEXT,
+    criado_em TEXT DEFAULT main.agora_texto(),
+    ultimo_envio TEXT,
+    total_envios INTEGER DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'ativo' CHECK(status IN ('ativo', 'inativo', 'cancelado'))
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_inscritos_email_unico ON main.inscritos(lower(email));
+CREATE INDEX IF NOT EXISTS idx_inscritos_email ON main.inscritos(email);
+-- Listagem com filtros e paginação por (criado_em, id) sem ordenar em memória
+CREATE INDEX IF NOT EXISTS idx_inscritos_status_confirmado_criado
+    ON main.inscritos(status, confirmado, criado_em DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_inscritos_status_criado ON main.inscritos(status, criado_em DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_inscritos_criado ON main.inscritos(criado_em DESC, id DESC);
+DROP INDEX IF EXISTS main.idx_inscritos_status;
+DROP INDEX IF EXISTS main.idx_inscritos_confirmado;
+
+-- Busca por substring (email/nome ILIKE '%q%') com trigramas. pg_trgm vem no
+-- contrib do PostgreSQL; sem ele (ou sem permissão) a busca continua, sem índice.
+DO $$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE INDEX IF NOT EXISTS idx_inscritos_email_trgm ON main.inscritos USING gin (email gin_trgm_ops);
+    CREATE INDEX IF NOT EXISTS idx_inscritos_nome_trgm ON main.inscritos USING gin (nome gin_trgm_ops);
+EXCEPTION WHEN feature_not_supported OR undefined_file OR insufficient_privilege THEN
+    RAISE NOTICE 'pg_trgm indisponível (%): busca de inscritos sem índice de trigramas', SQLERRM;
+END $$;
+
+-- Total por (status, confirmado), mantido por trigger
+CREATE TABLE IF NOT EXISTS main.inscritos_contagens (
+    status TEXT NOT NULL,
+    confirmado INTEGER NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (status, confirmado)
+);
+
+CREATE OR REPLACE FUNCTION main.trg_inscritos_contagem() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.status = NEW.status
+       AND COALESCE(OLD.confirmado, 0) = COALESCE(NEW.confirmado, 0) THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE main.inscritos_contagens SET total = total - 1
+        WHERE status = OLD.status AND confirmado = COALESCE(OLD.confirmado, 0);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO main.inscritos_contagens (status, confirmado, total)
+        VALUES (NEW.status, COALESCE(NEW.confirmado, 0), 1)
+        ON CONFLICT (status, confirmado) DO UPDATE SET total = main.inscritos_contagens.total + 1;
+    END IF;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS trg_inscritos_contagem ON main.inscritos;
+CREATE TRIGGER trg_inscritos_contagem
+    AFTER INSERT OR DELETE OR UPDATE OF status, confirmado ON main.inscritos
+    FOR EACH ROW EXECUTE FUNCTION main.trg_inscritos_contagem();
+
+-- Recontagem a cada aplicação do arquivo (o trigger mantém daí em diante)
+DELETE FROM main.inscritos_contagens;
+INSERT INTO main.inscritos_contagens (status, confirmado, total)
+SELECT status, COALESCE(confirmado, 0), COUNT(*) FROM main.inscritos GROUP BY status, COALESCE(confirmado, 0);
+
+CREATE TABLE IF NOT EXISTS main.envios_newsletter (
+    id INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    titulo TEXT NOT NULL,
+    conteudo TEXT NOT NULL,
+    noticias_ids TEXT,
+    destinatarios_total INTEGER DEFAULT 0,
+    destinatarios_entregues INTEGER DEFAULT 0,
+    aberturas INTEGER DEFAULT 0,
+    cliques INTEGER DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'rascunho' CHECK(status IN ('rascunho', 'enviando', 'enviado', 'cancelado')),
+    criado_por INTEGER,
+    criado_em TEXT DEFAULT main.agora_texto(),
+    enviado_em TEXT,
+    erro TEXT
+);
+
+-- ---------- arquivo (notícias frias) ----------
+
+CREATE TABLE IF NOT EXISTS arquivo.noticias (
+    id INTEGER PRIMARY KEY,
+    titulo TEXT,
+    subtitulo TEXT,
+    conteudo TEXT,
+    categoria TEXT,
+    autor TEXT,
+    autor_id INTEGER,
+    imagem_url TEXT,
+    data_publicacao TEXT,
+    data_atualizacao TEXT,
+    visualizacoes INTEGER,
+    status TEXT,
+    tags TEXT,
+    destaque INTEGER,
+    fonte TEXT,
+    slug TEXT,
+    enviada_newsletter INTEGER,
+    publicar_em TEXT,
+    categoria_id INTEGER,
+    arquivado_em TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_arquivo_slug ON arquivo.noticias(slug);
+CREATE INDEX IF NOT EXISTS idx_arquivo_status_data ON arquivo.noticias(status, data_publicacao DESC);
+CREATE INDEX IF NOT EXISTS idx_arquivo_categoria_id ON arquivo.noticias(categoria_id, status, data_publicacao DESC);
@@ -0,0 +1,79 @@
+"""Fixtures da suíte de testes.
+
+O app é importado sobre um banco descartável (DB_PATH num diretório
+temporário), nunca sobre o quartopodernews.db do repositório. A fixture `d`
+entrega um Database novo e já migrado em cada backend: SQLite sempre e
+PostgreSQL quando houver psycopg2 e TEST_DATABASE_URL (um servidor onde o
+usuário possa rodar CREATE DATABASE).
+"""
+
+import os
+import secrets
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+TMP = Path(tempfile.mkdtemp(prefix='qpn-testes-'))
+
+os.environ['DB_PATH'] = str(TMP / 'app.db')
+os.environ['DB_BACKEND'] = 'sqlite'
+os.environ['REPLICA_DB_PATH'] = ''
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+sys.path.insert(0, str(RAIZ))
+
+import app as qpn  # noqa: E402
+
+PG_DSN = os.getenv('TEST_DATABASE_URL', '')
+
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def backend(request, tmp_path):
+    """Backend de armazenamento sobre um banco novo e vazio, apagado no fim"""
+    if request.param == 'sqlite':
+        yield qpn.SQLiteBackend(tmp_path / 'teste.db', tmp_path / 'teste-arquivo.db')
+        return
+    if qpn.psycopg2 is None:
+        pytest.skip('psycopg2 não instalado')
+    if not PG_DSN:
+        pytest.skip('TEST_DATABASE_URL não definida')
+    nome = f'qpn_teste_{secrets.token_hex(4)}'
+    admin = qpn.psycopg2.connect(PG_DSN)
+    admin.autocommit = True
+    try:
+        with admin.cursor() as cursor:
+            cursor.execute(f'CREATE DATABASE {nome}')
+        pg = qpn.PostgresBackend(qpn.psycopg2.extensions.make_dsn(PG_DSN, dbname=nome), 1, 4)
+        try:
+            yield pg
+        finally:
+            pg.fechar()
+            with admin.cursor() as cursor:
+                cursor.execute(f'DROP DATABASE IF EXISTS {nome}')
+    finally:
+        admin.close()
+
+
+@pytest.fixture
+def d(backend):
+    """Database avulso sobre `backend`, com as migrações aplicadas"""
+    database = qpn.Database(backend)
+    yield database
+    database.liberar()
+
+
+def criar_noticia(d, titulo: str, **campos) -> dict:
+    noticia = d.create_noticia({'titulo': titulo, 'conteudo': f'<p>{titulo}.</p>', 'categoria': 'Política', **campos})
+    assert noticia, f'create_noticia({titulo!r}) falhou'
+    return noticia
+
+
+@pytest.fixture
+def admin():
+    """Cliente HTTP do app (banco global descartável) com sessão do admin padrão"""
+    cliente = qpn.app.test_client()
+    resposta = cliente.post('/api/login', json={'email': 'admin@quartopodernews.com', 'senha': 'admin123'})
+    assert resposta.status_code == 200, resposta.get_json()
+    return cliente
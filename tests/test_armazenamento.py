@@ -0,0 +1,297 @@
+"""Conformidade dos backends de armazenamento e tradução de SQL para o PostgreSQL.
+
+Os testes de Database usam só a API pública e rodam em cada backend da
+fixture `d` (ver conftest.py), cada um sobre um banco novo.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import app as qpn
+from conftest import criar_noticia
+
+
+# =====================================================
+# CONFORMIDADE DOS BACKENDS
+# =====================================================
+def test_schema_e_dados_iniciais(d):
+    assert d.schema_version() == qpn.Database.SCHEMA_VERSION
+    assert d.authenticate_user('admin@quartopodernews.com', 'admin123'), 'admin padrão'
+    assert len(d.get_all_categorias()) >= 6
+    assert d.get_categoria_by_nome('política')['nome'] == 'Política', 'nome de categoria sem distinção de caixa'
+    assert d.backend.indice_unico(d.conn, 'noticias', 'slug')
+
+
+def test_noticias_e_slugs(d):
+    corpo = '<p>Texto longo o bastante para passar do limite de compressão.</p>' * 40
+    a = criar_noticia(d, 'Conformidade Ação', conteudo=corpo, destaque=True, tags='Orçamento, Câmara')
+    b = criar_noticia(d, 'Conformidade Ação', categoria='política')
+    assert (a['slug'], b['slug']) == ('conformidade-acao', 'conformidade-acao-1')
+    assert b['categoria'] == 'Política' and b['categoria_id'] == a['categoria_id']
+    assert a['conteudo'] == corpo and a['destaque'] == 1
+    assert d.get_noticia_by_slug('conformidade-acao')['id'] == a['id']
+    gravadas = d.flush_visualizacoes()
+    assert gravadas == 1 and d.get_noticia_by_id(a['id'])['visualizacoes'] == 1
+    assert a['id'] in [n['id'] for n in d.get_destaques(50)]
+    c = d.update_noticia(b['id'], {'slug': 'conformidade-acao', 'titulo': 'Outro título'})
+    assert c['slug'] == 'conformidade-acao-1' and c['titulo'] == 'Outro título'
+
+
+def test_revisoes(d):
+    n = criar_noticia(d, 'Revisada', conteudo='<p>um.</p><p>dois.</p>')
+    d.update_noticia(n['id'], {'conteudo': '<p>um.</p><p>três.</p>', 'titulo': 'Revisada 2'})
+    assert [r['numero'] for r in d.list_revisoes(n['id'])] == [2, 1]
+    assert d.get_revisao(n['id'], 1)['conteudo'] == '<p>um.</p><p>dois.</p>'
+    assert d.get_revisao(n['id'], 2)['titulo'] == 'Revisada 2'
+
+
+def test_tags_e_contadores(d):
+    def total_categoria(categoria_id):
+        return {c['categoria_id']: c['total'] for c in d.get_noticias_count_by_categoria()}.get(categoria_id, 0)
+    cultura = d.get_categoria_by_nome('Cultura')['id']
+    antes = total_categoria(cultura)
+    n = criar_noticia(d, 'Tagueada', categoria='Cultura', tags='Conf Cinema; Conf Teatro')
+    assert d.get_tag('conf-teatro')['total'] == 1
+    assert [x['id'] for x in d.get_noticias_por_tag('conf-cinema')] == [n['id']]
+    assert total_categoria(cultura) == antes + 1
+
+    d.update_noticia(n['id'], {'status': 'rascunho', 'tags': 'Conf Cinema'})
+    assert d.get_tag('conf-teatro')['total'] == 0 and d.get_tag('conf-cinema')['total'] == 0
+    assert total_categoria(cultura) == antes
+
+    d.update_noticia(n['id'], {'status': 'publicada'})
+    assert d.get_tag('conf-cinema')['total'] == 1 and total_categoria(cultura) == antes + 1
+
+
+def test_listagens_e_busca(d):
+    n = criar_noticia(d, 'Busca Orquídea', categoria='Saúde', conteudo='<p>Sobre PLANTAS raras.</p>')
+    assert n['id'] in [x['id'] for x in d.search_noticias('orquídea')]
+    assert n['id'] in [x['id'] for x in d.search_noticias('plantas')], 'busca no corpo, sem distinção de caixa'
+    assert d.search_noticias('100%') == []
+    lista = d.get_all_noticias(categoria='Saúde', status='publicada')
+    assert n['id'] in [x['id'] for x in lista] and 'conteudo' not in lista[0]
+    completa = d.get_all_noticias(categoria_id=n['categoria_id'], incluir_conteudo=True)
+    assert [x['conteudo'] for x in completa if x['id'] == n['id']] == [n['conteudo']]
+
+
+def test_publicacao_agendada(d):
+    futuro = (datetime.now(timezone.utc) + timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S')
+    n = criar_noticia(d, 'Agendada', publicar_em=futuro)
+    assert n['status'] == 'rascunho'
+    assert n['id'] not in [x['id'] for x in d.publicar_agendadas()]
+
+    with d.transaction() as cursor:
+        cursor.execute('UPDATE noticias SET publicar_em = ? WHERE id = ?', ('2000-01-01 00:00:00', n['id']))
+    assert n['id'] in [x['id'] for x in d.publicar_agendadas()]
+    publicada = d.get_noticia_by_id(n['id'])
+    assert publicada['status'] == 'publicada' and publicada['data_publicacao'] == '2000-01-01 00:00:00'
+
+
+def test_mais_lidas_e_relacionadas(d):
+    a = criar_noticia(d, 'Reforma tributária aprovada no senado', tags='Reforma Tributária')
+    b = criar_noticia(d, 'Reforma tributária: o que muda no imposto', tags='Reforma Tributária')
+    for _ in range(3):
+        d.get_noticia_by_slug(a['slug'])
+    assert d.flush_visualizacoes() == 3
+    assert d.flush_visualizacoes() == 0
+    assert d.get_noticia_by_id(a['id'])['visualizacoes'] == 3
+
+    assert d.atualizar_ranking_mais_lidas() >= 1
+    assert d.get_mais_lidas(1)[0]['id'] == a['id']
+    assert d.calcular_relacionadas() > 0
+    assert b['id'] in [x['id'] for x in d.get_relacionadas(a['id'])]
+
+
+def test_transacoes_e_erros(d):
+    with pytest.raises(RuntimeError):
+        with d.transaction() as cursor:
+            cursor.execute("UPDATE categorias SET descricao = 'temporária' WHERE nome = 'Tecnologia'")
+            raise RuntimeError('desfazer')
+    assert d.get_categoria_by_nome('Tecnologia')['descricao'] != 'temporária'
+    assert not d.conn.in_transaction
+
+    with pytest.raises(d.backend.IntegrityError):
+        with d.transaction() as cursor:
+            cursor.execute('INSERT INTO categorias (nome) VALUES (?)', ('Tecnologia',))
+
+    primeira = d.reservar_tarefa('conformidade', 60)
+    segunda = d.reservar_tarefa('conformidade', 60)
+    assert primeira and not segunda
+
+
+def test_usuarios(d):
+    dados = {'nome': 'Conf', 'email': 'Conf@Exemplo.com', 'senha': 'segredo1', 'perfil': 'jornalista'}
+    u = d.create_usuario(dados)
+    assert u and u['email'] == 'conf@exemplo.com'
+    assert d.create_usuario(dados) is None, 'email duplicado'
+    assert d.authenticate_user('conf@exemplo.com', 'segredo1')
+    assert d.toggle_usuario_status(u['id'])['status'] == 'inactive'
+    assert d.get_user_by_email('conf@exemplo.com') is None
+
+
+def test_inscritos_busca_e_paginacao(d):
+    inscritos = [{'email': f'conf{i}@exemplo.com', 'nome': f'Leitora {"Araújo" if i % 3 == 0 else "Lima"}',
+                  'codigo_confirmacao': f'c{i}', 'confirmado': i % 2, 'status': 'ativo',
+                  'criado_em': f'2024-01-{1 + i // 2:02d} 10:00:00'} for i in range(10)]
+    inseridos = d.bulk_insert_inscritos(inscritos, lote=4)
+    assert inseridos == 10
+    assert d.contar_inscritos() == 10 and d.contar_inscritos(status='ativo', confirmado=1) == 5
+    assert {i['email'] for i in d.list_inscritos(q='araúj')} == {'conf0@exemplo.com', 'conf3@exemplo.com',
+                                                                 'conf6@exemplo.com', 'conf9@exemplo.com'}
+    assert d.contar_inscritos(q='CONF1@') == 1, 'busca sem distinção de caixa'
+    assert [i['email'] for i in d.list_inscritos(q='li')] == [i['email'] for i in d.list_inscritos(q='lim')]
+
+    paginas, cursor = [], None
+    while True:
+        pagina = d.list_inscritos(limit=3, cursor=cursor)
+        paginas.extend(i['id'] for i in pagina)
+        if len(pagina) < 3:
+            break
+        cursor = d.cursor_inscritos(pagina[-1])
+    assert paginas == [i['id'] for i in d.list_inscritos(limit=100)], 'keyset percorre tudo na mesma ordem'
+    assert len(set(paginas)) == 10
+
+    primeiro = d.get_inscrito_by_email('conf1@exemplo.com')
+    with d.transaction() as c:
+        c.execute("UPDATE inscritos SET status = 'cancelado', nome = 'Outro Nome' WHERE id = ?", (primeiro['id'],))
+    assert d.contar_inscritos(status='cancelado') == 1 and d.contar_inscritos(status='ativo') == 9
+    assert d.contar_inscritos(q='outro nome') == 1 and d.contar_inscritos(q='leitora lima') == 5
+
+
+def test_inscricao_idempotente(d):
+    total = d.contar_inscritos()
+    a = d.inscrever_email('Dupla@Exemplo.com', 'Dupla')
+    b = d.inscrever_email('dupla@exemplo.com ', '')
+    assert a and b and (a['id'], a['codigo_confirmacao']) == (b['id'], b['codigo_confirmacao']), 'duplo envio converge'
+    assert b['nome'] == 'Dupla' and d.contar_inscritos() == total + 1
+
+    primeira = d.confirmar_inscricao(a['codigo_confirmacao'])
+    repetida = d.confirmar_inscricao(a['codigo_confirmacao'])
+    assert primeira and repetida
+    assert not d.confirmar_inscricao('codigo-inexistente')
+    assert d.inscrever_email('dupla@exemplo.com', 'Outra') is None, 'confirmado não é reinscrito'
+    assert d.get_inscrito_by_email('dupla@exemplo.com')['nome'] == 'Dupla'
+
+    with d.transaction() as cursor:
+        cursor.execute("UPDATE inscritos SET status = 'cancelado' WHERE id = ?", (a['id'],))
+    c = d.inscrever_email('dupla@exemplo.com', 'Dupla Volta')
+    assert c['id'] == a['id'] and c['codigo_confirmacao'] != a['codigo_confirmacao']
+    assert (c['status'], c['confirmado'], c['criado_em']) == ('ativo', 0, a['criado_em'])
+    assert d.contar_inscritos(status='ativo', confirmado=0, q='dupla volta') == 1, 'contagens seguem o UPSERT'
+
+    resultado = d.inscrever_emails_lote([
+        (1, {'email': 'lote1@exemplo.com', 'nome': 'Lote'}, None),
+        (2, {'email': 'LOTE1@exemplo.com'}, None),
+        (3, {'email': 'sem-arroba'}, None),
+        (4, {'email': 'dupla@exemplo.com'}, None),
+        (5, None, 'JSON inválido'),
+    ])
+    assert resultado['linhas'] == 5 and [e['linha'] for e in resultado['erros']] == [3, 5], resultado
+    assert [i['email'] for i in resultado['inscritos']] == ['lote1@exemplo.com']
+    assert (resultado['pendentes'], resultado['ja_inscritos']) == (1, 1)
+    assert d.contar_inscritos() == total + 2
+
+
+def test_importacao_em_lote(d):
+    registros = [
+        (1, {'titulo': 'Lote A', 'conteudo': 'a', 'categoria': 'Tecnologia', 'tags': 'Conf Lote'}, None),
+        (2, {'titulo': 'Lote B', 'conteudo': 'b', 'categoria': 'tecnologia', 'data_publicacao': '2024-05-01T10:00:00'}, None),
+        (3, {'titulo': '', 'conteudo': 'c', 'categoria': 'Tecnologia'}, None),
+        (4, {'titulo': 'Lote A', 'conteudo': 'd', 'categoria': 'Tecnologia'}, None),
+    ]
+    resultado = d.bulk_import_noticias(registros, lote=10)
+    assert (resultado['importadas'], resultado['total_erros']) == (3, 1), resultado
+    assert d.get_noticia_by_slug('lote-a-1')['conteudo'] == 'd'
+    assert d.get_tag('conf-lote')['total'] == 1
+    assert len(list(d.iter_noticias(categoria='TECNOLOGIA'))) == 3
+
+
+def test_importacao_em_lote_guarda_so_max_erros(d, monkeypatch):
+    # Linhas pares com categoria inexistente; a gravação do primeiro lote falha na linha 1
+    registros = [(i, {'titulo': f'Limite {i}', 'conteudo': 'x', 'categoria': 'Tecnologia' if i % 2 else 'Nenhuma'},
+                  None) for i in range(1, 11)]
+    inserir = d._inserir_lote
+
+    def falha_na_primeira(lote, registrar_erro):
+        if lote[0][0] == 1:
+            registrar_erro(1, 'conflito')
+            lote = lote[1:]
+        return inserir(lote, registrar_erro)
+    monkeypatch.setattr(d, '_inserir_lote', falha_na_primeira)
+
+    resultado = d.bulk_import_noticias(registros, lote=4, max_erros=3)
+    assert (resultado['importadas'], resultado['total_erros']) == (4, 6), resultado
+    assert [e['linha'] for e in resultado['erros']] == [1, 2, 4]
+
+
+def test_arquivo(d):
+    velha = criar_noticia(d, 'Velha')
+    assert d.delete_noticia(velha['id'])
+    movidas = d.arquivar_noticias(365)
+    assert velha['id'] in [n['id'] for n in movidas]
+    assert d.get_noticia_by_id(velha['id'])['titulo'] == 'Velha'
+    assert d.get_noticia_by_slug('velha')['id'] == velha['id']
+    d.flush_visualizacoes()
+    assert d.get_noticia_by_id(velha['id'])['visualizacoes'] == 1
+    assert velha['id'] in [n['id'] for n in d.get_all_noticias(status='arquivada')]
+    assert velha['id'] in [row['id'] for row in d.iter_noticias()]
+
+    assert d.delete_noticia(velha['id'])
+    assert criar_noticia(d, 'Velha')['slug'] == 'velha-1', 'slug do arquivo continua reservado'
+    assert d.update_noticia(velha['id'], {'status': 'publicada'})['status'] == 'publicada'
+    assert d.get_arquivo_stats()['arquivadas'] == len(movidas) - 1
+    assert [r['numero'] for r in d.list_revisoes(velha['id'])] == [1], 'revisões ficam em main'
+
+
+# =====================================================
+# TRADUÇÃO DO DIALETO PARA O POSTGRESQL
+# =====================================================
+@pytest.mark.parametrize('sql, esperado', [
+    ('SELECT * FROM noticias WHERE slug = ?', 'SELECT * FROM noticias WHERE slug = %s'),
+    ('SELECT 1 WHERE email LIKE ? OR nome NOT LIKE ?', 'SELECT 1 WHERE email ILIKE %s OR nome NOT ILIKE %s'),
+    ('SELECT 1 WHERE a IS ?', 'SELECT 1 WHERE a IS NOT DISTINCT FROM %s'),
+    ('SELECT 1 WHERE a IS NOT ?', 'SELECT 1 WHERE a IS DISTINCT FROM %s'),
+    ('SELECT 1 WHERE a IS NULL AND b IS NOT NULL', 'SELECT 1 WHERE a IS NULL AND b IS NOT NULL'),
+    ('SELECT 1 WHERE a IS DISTINCT FROM b', 'SELECT 1 WHERE a IS DISTINCT FROM b'),
+    ("UPDATE t SET quando = CURRENT_TIMESTAMP WHERE id = ?",
+     "UPDATE t SET quando = to_char(now() AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS') WHERE id = %s"),
+    ('INSERT OR IGNORE INTO tags (slug) VALUES (?);', 'INSERT INTO tags (slug) VALUES (%s) ON CONFLICT DO NOTHING'),
+    ('BEGIN IMMEDIATE', f'BEGIN; SELECT pg_advisory_xact_lock({qpn.PG_LOCK_ESCRITA})'),
+    ('SELECT 1 WHERE ano LIKE ? AND taxa > 5 % 2', 'SELECT 1 WHERE ano ILIKE %s AND taxa > 5 %% 2'),
+])
+def test_sql_postgres_traduz_fora_dos_literais(sql, esperado):
+    assert qpn.sql_postgres(sql) == esperado
+
+
+@pytest.mark.parametrize('sql, esperado', [
+    # Literais ficam intactos: nem LIKE, nem IS, nem ? viram outra coisa
+    ("SELECT 'LIKE ? IS x' WHERE a LIKE ?", "SELECT 'LIKE ? IS x' WHERE a ILIKE %s"),
+    ("SELECT 1 WHERE nome = 'O''Brien IS ?' AND b IS ?",
+     "SELECT 1 WHERE nome = 'O''Brien IS ?' AND b IS NOT DISTINCT FROM %s"),
+    ("SELECT 1 WHERE s = 'INSERT OR IGNORE INTO x'", "SELECT 1 WHERE s = 'INSERT OR IGNORE INTO x'"),
+    # % dentro de literal precisa ser dobrado só quando há parâmetros
+    ("SELECT 1 WHERE a LIKE '100%' AND b = ?", "SELECT 1 WHERE a ILIKE '100%%' AND b = %s"),
+])
+def test_sql_postgres_preserva_literais(sql, esperado):
+    assert qpn.sql_postgres(sql) == esperado
+
+
+def test_sql_postgres_sem_parametros_nao_escapa_porcentagem():
+    assert qpn.sql_postgres("SELECT 1 WHERE a LIKE '10%' OR b % 2 = 0", False) == \
+        "SELECT 1 WHERE a ILIKE '10%' OR b % 2 = 0"
+
+
+def test_sql_postgres_nao_confunde_palavras():
+    # \b: colunas que contêm LIKE/IS não são reescritas
+    assert qpn.sql_postgres('SELECT ISBN, UNLIKELY FROM t') == 'SELECT ISBN, UNLIKELY FROM t'
+
+
+@pytest.mark.skipif(qpn.psycopg2 is None, reason='psycopg2 não instalado')
+@pytest.mark.parametrize('sql', [
+    'PRAGMA foreign_keys = OFF',
+    'INSERT OR REPLACE INTO t (a) VALUES (?)',
+])
+def test_sql_postgres_recusa_sem_equivalente(sql):
+    with pytest.raises(qpn.psycopg2.NotSupportedError):
+        qpn.sql_postgres(sql)
@@ -0,0 +1,134 @@
+"""Backup e restore do banco SQLite junto com o arquivo de notícias frias."""
+
+import gzip
+import shutil
+import sqlite3
+import tarfile
+import time
+
+import pytest
+
+import app as qpn
+from conftest import criar_noticia
+
+
+@pytest.fixture
+def gerenciadores(tmp_path, monkeypatch):
+    """BackupManager/RestoreManager gravando num diretório temporário"""
+    config = {**qpn.BACKUP_CONFIG, 'step_sleep': 0}
+    backups = qpn.BackupManager(tmp_path, config)
+    monkeypatch.setattr(qpn, 'backup_manager', backups)
+    return backups, qpn.RestoreManager(tmp_path, config)
+
+
+@pytest.fixture
+def quente_e_fria():
+    """Uma notícia em main e outra, com revisão, movida para o arquivo"""
+    quente = criar_noticia(qpn.db, 'Backup quente')
+    fria = criar_noticia(qpn.db, 'Backup fria')
+    qpn.db.update_noticia(fria['id'], {'subtitulo': 'editada'})
+    qpn.db.delete_noticia(fria['id'])
+    assert fria['id'] in {n['id'] for n in qpn.db.arquivar_noticias(365)}
+    return quente, fria
+
+
+def ids(path, esquema_tabela='noticias'):
+    conn = sqlite3.connect(path)
+    try:
+        return {row[0] for row in conn.execute(f'SELECT id FROM {esquema_tabela}')}
+    finally:
+        conn.close()
+
+
+def extrair(backup, destino, membro=None):
+    """Conteúdo do backup como o upload o recebe (.tar descomprimido) ou um membro só"""
+    if membro is None:
+        with gzip.open(backup, 'rb') as fin, open(destino, 'wb') as fout:
+            shutil.copyfileobj(fin, fout)
+    else:
+        with tarfile.open(backup) as tar, tar.extractfile(membro) as fin, open(destino, 'wb') as fout:
+            shutil.copyfileobj(fin, fout)
+    return destino
+
+
+def restaurar(restore, upload):
+    job = restore._new_job('restore', etapa='validando', backup_previo=None, inclui_arquivo=None)
+    restore._run_job(job, upload)
+    return job
+
+
+def test_backup_inclui_o_arquivo(gerenciadores, quente_e_fria, tmp_path):
+    backups, _ = gerenciadores
+    quente, fria = quente_e_fria
+    job = backups.run()
+    assert job['status'] == 'concluido', job['erro']
+    assert job['arquivo'].endswith('.tar.gz')
+
+    backup = tmp_path / job['arquivo']
+    with tarfile.open(backup) as tar:
+        assert sorted(tar.getnames()) == sorted(qpn.BackupManager.MEMBROS.values())
+    principal = extrair(backup, tmp_path / 'main.db', qpn.BackupManager.MEMBROS['main'])
+    arquivo = extrair(backup, tmp_path / 'arquivo.db', qpn.BackupManager.MEMBROS['arquivo'])
+    assert quente['id'] in ids(principal) and fria['id'] not in ids(principal)
+    assert fria['id'] in ids(arquivo)
+    assert backups.list_backups()[0]['inclui_arquivo'] is True
+
+
+def test_backup_repetido_e_reaproveitado(gerenciadores):
+    backups, _ = gerenciadores
+    primeiro = backups.run()
+    segundo = backups.run()
+    assert segundo['reaproveitado'] and segundo['arquivo'] == primeiro['arquivo']
+
+
+def test_restore_devolve_principal_e_arquivo(gerenciadores, quente_e_fria, tmp_path):
+    backups, restore = gerenciadores
+    quente, fria = quente_e_fria
+    backup = tmp_path / backups.run()['arquivo']
+
+    depois = criar_noticia(qpn.db, 'Depois do backup')
+    qpn.db.update_noticia(fria['id'], {'subtitulo': 'volta para main'})  # sai do arquivo
+
+    job = restaurar(restore, extrair(backup, tmp_path / 'upload.db'))
+    assert job['status'] == 'concluido', job['erro']
+    assert job['inclui_arquivo'] is True
+    assert qpn.db.get_noticia_by_id(depois['id']) is None
+    assert fria['id'] in ids(qpn.ARCHIVE_DB_PATH) and fria['id'] not in ids(qpn.DB_PATH)
+    assert qpn.db.get_noticia_by_id(fria['id'])['subtitulo'] != 'volta para main'
+    assert qpn.db.get_noticia_by_id(quente['id'])
+
+
+def test_db_avulso_aceita_revisoes_de_noticias_arquivadas(gerenciadores, quente_e_fria, tmp_path):
+    backups, restore = gerenciadores
+    backup = tmp_path / backups.run()['arquivo']
+    upload = extrair(backup, tmp_path / 'avulso.db', qpn.BackupManager.MEMBROS['main'])
+    restore._validate({'main': upload})  # o id está no arquivo atual
+
+
+def test_referencia_quebrada_rejeita_o_upload(gerenciadores, tmp_path):
+    backups, restore = gerenciadores
+    backup = tmp_path / backups.run()['arquivo']
+    upload = extrair(backup, tmp_path / 'quebrado.db', qpn.BackupManager.MEMBROS['main'])
+    conn = sqlite3.connect(upload)
+    conn.execute("INSERT INTO noticias_revisoes (noticia_id, numero, tipo, dados) VALUES (999999, 1, 'snapshot', x'00')")
+    conn.commit()
+    conn.close()
+
+    job = restaurar(restore, upload)
+    assert job['status'] == 'invalido'
+    assert 'noticias_revisoes' in job['erro']
+    assert job['backup_previo'] is None
+
+
+def test_exportacao_roda_em_segundo_plano(gerenciadores, admin):
+    resposta = admin.get('/api/admin/db/export')
+    assert resposta.status_code == 202
+    job = resposta.get_json()['job']
+    for _ in range(100):
+        job = admin.get(f"/api/admin/db/backups/jobs/{job['id']}").get_json()['job']
+        if job['status'] != 'executando':
+            break
+        time.sleep(0.05)
+    assert job['status'] == 'concluido', job['erro']
+    download = admin.get(f"/api/admin/db/backups/{job['arquivo']}")
+    assert download.status_code == 200 and download.mimetype == 'application/gzip'
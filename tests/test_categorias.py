@@ -0,0 +1,68 @@
+"""Notícias só usam categorias existentes; nomes são comparados sem distinção de caixa."""
+
+import pytest
+
+import app as qpn
+from conftest import criar_noticia
+
+
+def test_criar_ou_mudar_para_categoria_inexistente_e_erro(d):
+    total = len(d.get_all_categorias())
+    with pytest.raises(ValueError, match='Inexistente'):
+        d.create_noticia({'titulo': 'Sem categoria', 'conteudo': 'x', 'categoria': 'Inexistente'})
+    n = criar_noticia(d, 'Com categoria')
+    with pytest.raises(ValueError):
+        d.update_noticia(n['id'], {'categoria': 'Inexistente'})
+    assert len(d.get_all_categorias()) == total
+    assert d.get_noticia_by_id(n['id'])['categoria'] == 'Política'
+
+
+def test_importacao_reporta_categoria_inexistente_por_linha(d):
+    total = len(d.get_all_categorias())
+    registros = [
+        (1, {'titulo': 'Lote A', 'conteudo': 'a', 'categoria': 'ECONOMIA'}, None),
+        (2, {'titulo': 'Lote B', 'conteudo': 'b', 'categoria': 'Inexistente'}, None),
+        (3, {'titulo': 'Lote C', 'conteudo': 'c', 'categoria': 'Inexistente'}, None),
+    ]
+    resultado = d.bulk_import_noticias(registros, lote=10)
+    assert resultado['importadas'] == 1
+    assert resultado['erros'] == [{'linha': 2, 'erro': 'categoria inexistente: Inexistente'},
+                                  {'linha': 3, 'erro': 'categoria inexistente: Inexistente'}]
+    assert len(d.get_all_categorias()) == total
+    assert d.get_noticia_by_slug('lote-a')['categoria'] == 'Economia'
+
+
+def test_filtro_por_nome_sem_distincao_de_caixa(d):
+    n = criar_noticia(d, 'Filtro caixa', categoria='Esportes')
+    for nome in ('Esportes', 'esportes', 'ESPORTES'):
+        assert n['id'] in [x['id'] for x in d.get_all_noticias(categoria=nome)], nome
+    assert d.get_all_noticias(categoria='Inexistente') == []
+
+
+def test_rotas_recusam_categoria_inexistente(admin):
+    total = len(qpn.db.get_all_categorias())
+    dados = {'titulo': 'Rota categoria', 'conteudo': 'x', 'autor': 'Redação', 'categoria': 'Inexistente'}
+    resposta = admin.post('/api/noticias', json=dados)
+    assert resposta.status_code == 400 and 'Inexistente' in resposta.get_json()['error']
+
+    resposta = admin.post('/api/noticias', json={**dados, 'categoria': 'cultura'})
+    assert resposta.status_code == 201
+    noticia = resposta.get_json()['noticia']
+    assert noticia['categoria'] == 'Cultura'
+
+    resposta = admin.put(f"/api/noticias/{noticia['id']}", json={'categoria': 'Inexistente'})
+    assert resposta.status_code == 400
+    assert len(qpn.db.get_all_categorias()) == total
+
+
+def test_admin_cria_categoria_explicitamente(admin):
+    resposta = admin.post('/api/admin/categorias', json={'nome': 'Ciência', 'visivel': False})
+    assert resposta.status_code == 201
+    categoria = resposta.get_json()['categoria']
+    assert categoria['nome'] == 'Ciência' and not categoria['visivel']
+    assert admin.post('/api/admin/categorias', json={'nome': 'ciência'}).status_code == 409
+    assert admin.post('/api/admin/categorias', json={'nome': ' '}).status_code == 400
+
+    resposta = admin.post('/api/noticias', json={'titulo': 'Na nova', 'conteudo': 'x', 'autor': 'Redação',
+                                                 'categoria': 'Ciência'})
+    assert resposta.status_code == 201
@@ -0,0 +1,44 @@
+"""Exportação em streaming (CSV/JSONL) de notícias e inscritos."""
+
+import csv
+import io
+import json
+
+import app as qpn
+
+
+def _csv(d, rows) -> list:
+    return list(csv.reader(io.StringIO(''.join(qpn.serializar_registros(rows, 'csv')))))
+
+
+def test_csv_neutraliza_formulas(d):
+    for i, nome in enumerate(['=HYPERLINK("http://x","y")', '+1', '-2+3', '@SUM(A1)', 'Ana']):
+        d.inscrever_email(f'formula{i}@exemplo.com', nome)
+    linhas = _csv(d, d.iter_inscritos())
+    coluna = linhas[0].index('nome')
+    assert [linha[coluna] for linha in linhas[1:]] == [
+        '\'=HYPERLINK("http://x","y")', "'+1", "'-2+3", "'@SUM(A1)", 'Ana']
+
+
+def test_jsonl_mantem_valores_originais(d):
+    d.inscrever_email('jsonl@exemplo.com', '=1+1')
+    texto = ''.join(qpn.serializar_registros(d.iter_inscritos(), 'jsonl'))
+    assert [json.loads(linha)['nome'] for linha in texto.splitlines()] == ['=1+1']
+
+
+def test_csv_vazio_tem_cabecalho(d):
+    assert _csv(d, d.iter_inscritos(q='ninguém')) == [list(qpn.Database.INSCRITOS_EXPORT_COLUNAS)]
+    cabecalho = _csv(d, d.iter_noticias(categoria='Inexistente'))
+    assert len(cabecalho) == 1 and {'id', 'slug', 'titulo'} <= set(cabecalho[0])
+    assert ''.join(qpn.serializar_registros(d.iter_inscritos(q='ninguém'), 'jsonl')) == ''
+
+
+def test_rota_exporta_csv_seguro(admin):
+    qpn.db.inscrever_email('rota-export@exemplo.com', '=cmd|" /C calc"!A0')
+    resposta = admin.get('/api/admin/export/inscritos?formato=csv&q=rota-export')
+    assert resposta.status_code == 200 and resposta.mimetype == 'text/csv'
+    linhas = list(csv.reader(io.StringIO(resposta.get_data(as_text=True))))
+    assert linhas[1][linhas[0].index('nome')] == '\'=cmd|" /C calc"!A0'
+
+    resposta = admin.get('/api/admin/export/inscritos?formato=csv&q=ninguem-mesmo')
+    assert resposta.get_data(as_text=True).strip() == ','.join(qpn.Database.INSCRITOS_EXPORT_COLUNAS)
@@ -0,0 +1,38 @@
+"""Importação de inscritos de parceiros: reimportar a mesma lista não reenvia confirmações."""
+
+import app as qpn
+
+
+def test_reimportar_nao_conta_pendentes_como_novos(d):
+    registros = [(1, {'email': 'parceiro1@exemplo.com', 'nome': 'Um'}, None),
+                 (2, {'email': 'parceiro2@exemplo.com', 'nome': 'Dois'}, None)]
+    primeira = d.inscrever_emails_lote(registros)
+    assert [i['email'] for i in primeira['inscritos']] == ['parceiro1@exemplo.com', 'parceiro2@exemplo.com']
+
+    segunda = d.inscrever_emails_lote(registros)
+    assert segunda['inscritos'] == [] and segunda['pendentes'] == 2
+
+    d.confirmar_inscricao(primeira['inscritos'][0]['codigo_confirmacao'])
+    with d.transaction() as cursor:
+        cursor.execute("UPDATE inscritos SET status = 'cancelado' WHERE email = ?", ('parceiro2@exemplo.com',))
+    terceira = d.inscrever_emails_lote(registros)
+    assert [i['email'] for i in terceira['inscritos']] == ['parceiro2@exemplo.com'], 'reativada recebe email'
+    assert (terceira['pendentes'], terceira['ja_inscritos']) == (0, 1)
+
+
+def test_cli_envia_confirmacao_so_uma_vez(tmp_path, monkeypatch):
+    arquivo = tmp_path / 'parceiros.csv'
+    arquivo.write_text('email,nome\ncli1@exemplo.com,Um\ncli2@exemplo.com,Dois\nruim,Três\n', encoding='utf-8')
+    enviados = []
+    monkeypatch.setattr(qpn.email_service, 'send_email', lambda para, *mensagem: enviados.append(para) or True)
+    runner = qpn.app.test_cli_runner()
+
+    resultado = runner.invoke(args=['import-inscritos', str(arquivo), '--enviar-confirmacao'])
+    assert resultado.exit_code == 0, resultado.output
+    assert sorted(enviados) == ['cli1@exemplo.com', 'cli2@exemplo.com']
+    assert '2 inscrição(ões) nova(s)' in resultado.output and 'linha 4' in resultado.output
+
+    resultado = runner.invoke(args=['import-inscritos', str(arquivo), '--enviar-confirmacao'])
+    assert resultado.exit_code == 0, resultado.output
+    assert len(enviados) == 2, 'pendentes não recebem o email de novo'
+    assert '2 já aguardando confirmação' in resultado.output
@@ -0,0 +1,109 @@
+"""Migração de bancos criados por versões antigas (schema anterior a user_version)."""
+
+import sqlite3
+
+import pytest
+
+import app as qpn
+
+# Schema da primeira versão publicada (sem PRAGMA user_version)
+SCHEMA_BASE = '''
+CREATE TABLE usuarios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    email TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    senha_hash TEXT NOT NULL,
+    perfil TEXT NOT NULL CHECK(perfil IN ('admin', 'jornalista')),
+    status TEXT NOT NULL DEFAULT 'active' CHECK(status IN ('active', 'inactive')),
+    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    observacoes TEXT,
+    ultimo_login TIMESTAMP
+);
+CREATE TABLE noticias (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    titulo TEXT NOT NULL,
+    subtitulo TEXT,
+    conteudo TEXT NOT NULL,
+    categoria TEXT NOT NULL,
+    autor TEXT NOT NULL,
+    autor_id INTEGER,
+    imagem_url TEXT,
+    data_publicacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    data_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    visualizacoes INTEGER DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'publicada' CHECK(status IN ('rascunho', 'publicada', 'arquivada')),
+    tags TEXT,
+    destaque BOOLEAN DEFAULT 0,
+    fonte TEXT,
+    {slug}
+    enviada_newsletter BOOLEAN DEFAULT 0
+);
+CREATE TABLE categorias (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL UNIQUE,
+    descricao TEXT,
+    cor TEXT DEFAULT '#003366',
+    icon TEXT DEFAULT 'fas fa-folder',
+    ordem INTEGER DEFAULT 0,
+    visivel BOOLEAN DEFAULT 1
+);
+CREATE TABLE inscritos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    nome TEXT,
+    codigo_confirmacao TEXT NOT NULL,
+    confirmado BOOLEAN DEFAULT 0,
+    receber_destaques BOOLEAN DEFAULT 1,
+    receber_todas BOOLEAN DEFAULT 0,
+    categorias_preferidas TEXT,
+    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    ultimo_envio TIMESTAMP,
+    total_envios INTEGER DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'ativo' CHECK(status IN ('ativo', 'inativo', 'cancelado'))
+);
+CREATE TABLE envios_newsletter (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    titulo TEXT NOT NULL,
+    conteudo TEXT NOT NULL,
+    noticias_ids TEXT,
+    destinatarios_total INTEGER DEFAULT 0,
+    destinatarios_entregues INTEGER DEFAULT 0,
+    aberturas INTEGER DEFAULT 0,
+    cliques INTEGER DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'rascunho' CHECK(status IN ('rascunho', 'enviando', 'enviado', 'cancelado')),
+    criado_por INTEGER,
+    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    enviado_em TIMESTAMP,
+    erro TEXT
+);
+'''
+
+
+@pytest.mark.parametrize('com_slug', [False, True], ids=['antes-do-slug', 'com-slug'])
+def test_migra_banco_da_versao_base(tmp_path, com_slug):
+    path = tmp_path / 'antigo.db'
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA_BASE.format(slug='slug TEXT,' if com_slug else ''))
+    conn.execute("INSERT INTO categorias (nome, ordem) VALUES ('Política', 1)")
+    conn.executemany(
+        "INSERT INTO noticias (titulo, conteudo, categoria, autor, tags) VALUES (?, ?, 'Política', 'Redação', ?)",
+        [('Câmara aprova orçamento', '<p>um.</p>', 'orçamento'), ('Câmara aprova orçamento', '<p>dois.</p>', ''),
+         ('Outra pauta', '<p>três.</p>', None)])
+    if com_slug:
+        conn.execute("UPDATE noticias SET slug = '' WHERE id = 3")
+    conn.commit()
+    conn.close()
+
+    d = qpn.Database(qpn.SQLiteBackend(path, tmp_path / 'antigo-arquivo.db'))
+    try:
+        assert d.schema_version() == qpn.Database.SCHEMA_VERSION
+        noticias = {n['id']: n for n in d.iter_noticias()}
+        if not com_slug:
+            assert [noticias[i]['slug'] for i in (1, 2, 3)] == ['camara-aprova-orcamento', 'camara-aprova-orcamento-1',
+                                                                'outra-pauta']
+        assert noticias[2]['conteudo'] == '<p>dois.</p>'
+        assert noticias[1]['categoria'] == 'Política'
+        assert d.get_noticias_por_tag('orcamento')[0]['id'] == 1
+    finally:
+        d.liberar()
@@ -0,0 +1,82 @@
+"""Snapshots da réplica de leitura: quando copiar e consistência entre main e arquivo."""
+
+import shutil
+import sqlite3
+import time
+
+import pytest
+
+import app as qpn
+from conftest import criar_noticia
+
+
+@pytest.fixture
+def replica(tmp_path):
+    return qpn.ReadReplica({**qpn.REPLICA_CONFIG, 'path': str(tmp_path / 'replica.db')})
+
+
+@pytest.fixture
+def adiante(monkeypatch):
+    """Publica como se alguns segundos tivessem passado desde as escritas do teste"""
+    real = time.time
+
+    def publicar(replica, **kwargs):
+        monkeypatch.setattr(qpn.time, 'time', lambda: real() + 10)
+        try:
+            return replica.publicar(**kwargs)
+        finally:
+            monkeypatch.setattr(qpn.time, 'time', real)
+    return publicar
+
+
+def gerado_em(replica):
+    conn = sqlite3.connect(replica.path)
+    try:
+        return conn.execute('SELECT gerado_em FROM replica_snapshot').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_copia_so_quando_o_conteudo_muda(replica, adiante):
+    noticia = criar_noticia(qpn.db, 'Na réplica')
+    with qpn.db.transaction() as cursor:  # a edição abaixo cai noutro segundo
+        cursor.execute("UPDATE noticias SET data_atualizacao = '2020-01-01 00:00:00' WHERE id = ?", (noticia['id'],))
+    assert adiante(replica) is True
+    assert adiante(replica) is False
+
+    qpn.db.registrar_visualizacao(noticia['id'])
+    qpn.db.flush_visualizacoes()
+    antes = gerado_em(replica)
+    assert adiante(replica) is False  # contadores não disparam cópia
+    assert gerado_em(replica) > antes
+
+    qpn.db.update_noticia(noticia['id'], {'subtitulo': 'mudou'})
+    assert adiante(replica) is True
+    assert adiante(replica, forcar=True) is True
+
+
+def test_escrita_no_mesmo_segundo_nao_se_perde(replica):
+    noticia = criar_noticia(qpn.db, 'Mesmo segundo')
+    assert replica.publicar() is True
+    qpn.db.update_noticia(noticia['id'], {'subtitulo': 'de novo'})
+    assert replica.publicar() is True
+    conn = replica.conexao()
+    assert conn.execute('SELECT subtitulo FROM noticias WHERE id = ?', (noticia['id'],)).fetchone()[0] == 'de novo'
+
+
+def test_main_e_arquivo_do_mesmo_snapshot(replica, adiante, tmp_path):
+    fria = criar_noticia(qpn.db, 'Vai para o arquivo')
+    qpn.db.delete_noticia(fria['id'])
+    qpn.db.arquivar_noticias(365)
+    assert adiante(replica) is True
+    conn = replica.conexao()
+    assert conn.execute('SELECT 1 FROM arquivo.noticias WHERE id = ?', (fria['id'],)).fetchone()
+    assert not conn.execute('SELECT 1 FROM main.noticias WHERE id = ?', (fria['id'],)).fetchone()
+
+    # Arquivo de outro snapshot (troca no meio): o leitor volta para o primário
+    antigo = tmp_path / 'arquivo-antigo.db'
+    shutil.copy(replica.arquivo_path, antigo)
+    criar_noticia(qpn.db, 'Outra')
+    assert adiante(replica) is True
+    shutil.copy(antigo, replica.arquivo_path)
+    assert replica.conexao() is None
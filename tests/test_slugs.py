@@ -0,0 +1,120 @@
+"""Alocação de slugs únicos, inclusive com criação concorrente da mesma manchete."""
+
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+import app as qpn
+from conftest import criar_noticia
+
+
+def test_base_livre_e_usada_mesmo_com_sufixos(d):
+    criar_noticia(d, 'Outro', slug='abc-1')
+    assert criar_noticia(d, 'Qualquer', slug='abc')['slug'] == 'abc'
+    assert criar_noticia(d, 'Qualquer', slug='abc')['slug'] == 'abc-2'
+
+
+def test_sufixo_de_ano_nao_e_contador(d):
+    assert criar_noticia(d, 'Resultado 2024')['slug'] == 'resultado-2024'
+    assert criar_noticia(d, 'Resultado')['slug'] == 'resultado'
+    assert criar_noticia(d, 'Resultado')['slug'] == 'resultado-1'
+    assert criar_noticia(d, 'Resultado 2024')['slug'] == 'resultado-2024-1'
+
+
+def test_contador_pula_faixa_de_anos(d):
+    criar_noticia(d, 'Ao vivo')
+    criar_noticia(d, 'Outro', slug='ao-vivo-1899')
+    assert criar_noticia(d, 'Ao vivo')['slug'] == 'ao-vivo-2101'
+
+
+def test_atualizacao_mantem_o_proprio_slug(d):
+    a = criar_noticia(d, 'Mega-Sena')
+    criar_noticia(d, 'Mega-Sena')
+    assert d.update_noticia(a['id'], {'slug': 'mega-sena'})['slug'] == 'mega-sena'
+
+
+def test_slug_de_noticia_arquivada_continua_reservado(d):
+    velha = criar_noticia(d, 'Velha')
+    d.delete_noticia(velha['id'])
+    d.arquivar_noticias(365)
+    assert criar_noticia(d, 'Velha')['slug'] == 'velha-1'
+
+
+def test_importacao_em_lote_segue_as_mesmas_regras(d):
+    criar_noticia(d, 'Outro', slug='placar-1')
+    registros = [(i, {'titulo': 'Placar', 'conteudo': 'x', 'categoria': 'Esportes'}, None) for i in range(1, 4)]
+    registros.append((4, {'titulo': 'Placar 2024', 'conteudo': 'x', 'categoria': 'Esportes'}, None))
+    resultado = d.bulk_import_noticias(registros, lote=10)
+    assert resultado['importadas'] == 4 and resultado['erros'] == [], resultado
+    slugs = {row['slug'] for row in d.iter_noticias()}
+    assert {'placar', 'placar-1', 'placar-2', 'placar-3', 'placar-2024'} <= slugs
+
+
+# =====================================================
+# CONCORRÊNCIA
+# =====================================================
+TITULO = 'Resultado da Mega-Sena'
+
+
+def esperados(total: int) -> set:
+    return {'resultado-da-mega-sena'} | {f'resultado-da-mega-sena-{i}' for i in range(1, total)}
+
+
+def _novo_backend(backend):
+    """Outro backend sobre o mesmo banco (uma conexão/pool por processo)"""
+    if isinstance(backend, qpn.SQLiteBackend):
+        return qpn.SQLiteBackend(backend.path, backend.arquivo_path)
+    return qpn.PostgresBackend(backend.dsn, 1, 2)
+
+
+def _criar_varias(backend, quantidade: int, saida):
+    d = qpn.Database(_novo_backend(backend))
+    slugs = [criar_noticia(d, TITULO)['slug'] for _ in range(quantidade)]
+    d.liberar()
+    saida.put(slugs)
+
+
+def test_criacao_concorrente_em_threads(d):
+    threads, por_thread = 8, 5
+    slugs, erros = [], []
+    barreira = threading.Barrier(threads)
+
+    def criar():
+        try:
+            barreira.wait()
+            for _ in range(por_thread):
+                slugs.append(criar_noticia(d, TITULO)['slug'])
+        except Exception as e:  # a falha aparece no assert abaixo
+            erros.append(e)
+        finally:
+            d.liberar()
+
+    trabalhadores = [threading.Thread(target=criar) for _ in range(threads)]
+    for t in trabalhadores:
+        t.start()
+    for t in trabalhadores:
+        t.join()
+
+    assert erros == []
+    assert len(slugs) == threads * por_thread
+    assert set(slugs) == esperados(threads * por_thread)
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requer fork')
+def test_criacao_concorrente_em_processos(d, backend):
+    processos, por_processo = 4, 5
+    contexto = multiprocessing.get_context('fork')
+    saida = contexto.Queue()
+    filhos = [contexto.Process(target=_criar_varias, args=(backend, por_processo, saida)) for _ in range(processos)]
+    for p in filhos:
+        p.start()
+    slugs = [slug for _ in filhos for slug in saida.get(timeout=60)]
+    for p in filhos:
+        p.join(timeout=60)
+
+    assert [p.exitcode for p in filhos] == [0] * processos
+    assert len(slugs) == processos * por_processo
+    assert set(slugs) == esperados(processos * por_processo)
+    assert set(slugs) == {row['slug'] for row in d.iter_noticias()} & esperados(processos * por_processo)